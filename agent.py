@@ -1,62 +1,102 @@
 # agent.py
+import os
 import re
 import json
-import pickle
-from datetime import datetime, timedelta
-import spacy
+import threading
+import time
+import streamlit as st
+from types import MappingProxyType
+import model_registry
+from utils import (
+    load_nlp_models, nlp_doc, nlp_docs, extract_tags, extract_entities
+)
+from date_parser import parse_datetime
+from keyword_matcher import KeywordMatcher
+
+# Lookup tables are built once per process and read-only, so the cached
+# agent can be shared by every Streamlit session
+CATEGORY_KEYWORDS = MappingProxyType({
+    "shopping": ("buy", "purchase", "order", "groceries", "shop"),
+    "work": ("report", "meeting", "project", "email"),
+    "office": ("submit", "follow-up", "document"),
+    "interview": ("interview", "resume", "job"),
+    "personal": ("call", "movie", "relax"),
+    "health": ("doctor", "medicine", "gym"),
+    "finance": ("bill", "pay", "salary"),
+    "learning": ("study", "learn", "course"),
+    "travel": ("travel", "trip", "ticket"),
+    "home": ("clean", "repair", "cook")
+})
+BASE_DURATIONS = MappingProxyType({
+    "shopping": 45, "work": 90, "office": 30, "interview": 60,
+    "personal": 30, "health": 45, "finance": 30,
+    "learning": 60, "travel": 120, "home": 60, "other": 45
+})
+DURATION_MULTIPLIERS = MappingProxyType({
+    "quick": 0.3, "fast": 0.3, "brief": 0.4,
+    "standard": 1.0, "complete": 1.7, "deep": 2.0
+})
+KEYWORD_DURATIONS = MappingProxyType({
+    "email": 15, "call": 20, "meeting": 60,
+    "report": 120, "project": 180, "shopping": 60,
+    "study": 90, "doctor": 60
+})
+CATEGORY_SUGGESTIONS = MappingProxyType({
+    "work": ("Prepare agenda", "Set reminders"),
+    "shopping": ("Make a list", "Compare prices"),
+    "health": ("Book appointment", "Bring ID"),
+    "finance": ("Check balance", "Keep docs ready")
+})
+HIGH_PRIORITY_WORDS = ("urgent", "asap")
+MEDIUM_PRIORITY_WORDS = ("important", "priority")
+DURATION_PATTERNS = (
+    re.compile(r'(\d+)\s*(minutes?|mins?)'),
+    re.compile(r'(\d+)\s*(hours?|hrs?)'),
+)
+WARMUP_TEXT = "Prepare the quarterly report for the team meeting tomorrow at 9am #work"
+
+# Model predictions whose top-class probability is below this defer to the
+# keyword rules (when a keyword matches)
+CONFIDENCE_THRESHOLD = float(os.environ.get("CATEGORY_CONFIDENCE_THRESHOLD", "0.4"))
+_NON_LETTERS = re.compile(r'[^a-z\s]')
+
+# Built once; each scans a text in a single pass
+_multiplier_matcher = KeywordMatcher(DURATION_MULTIPLIERS)
+_duration_matcher = KeywordMatcher(KEYWORD_DURATIONS)
+_category_matcher = KeywordMatcher.from_groups(CATEGORY_KEYWORDS)
+
+
+def normalize_task_text(text):
+    """Lowercase, letters only, single spaces: the form the categorizer was trained on."""
+    return " ".join(_NON_LETTERS.sub('', text.lower()).split())
 
-from utils import load_nlp_models, extract_tags, parse_date_expressions
 
 class AdvancedTaskAgent:
     def __init__(self):
-        self.nlp = load_nlp_models()
-        self.categories = {
-            "shopping": ["buy", "purchase", "order", "groceries", "shop"],
-            "work": ["report", "meeting", "project", "email"],
-            "office": ["submit", "follow-up", "document"],
-            "interview": ["interview", "resume", "job"],
-            "personal": ["call", "movie", "relax"],
-            "health": ["doctor", "medicine", "gym"],
-            "finance": ["bill", "pay", "salary"],
-            "learning": ["study", "learn", "course"],
-            "travel": ["travel", "trip", "ticket"],
-            "home": ["clean", "repair", "cook"]
-        }
+        self.categories = CATEGORY_KEYWORDS
+        self.category_matcher = _category_matcher
+
+    @property
+    def nlp(self):
+        # spaCy is loaded on the first parse, not when a page builds the agent
+        return load_nlp_models()
 
-    def extract_entities(self, text):
+    def extract_entities(self, text, doc=None):
         if not self.nlp:
             return []
-        doc = self.nlp(text)
-        return [ent.text for ent in doc.ents if ent.label_ in ['PERSON', 'ORG', 'GPE', 'DATE', 'TIME']]
+        return extract_entities(text, doc=doc)
 
     def estimate_duration(self, text, category):
-        base_durations = {
-            "shopping": 45, "work": 90, "office": 30, "interview": 60,
-            "personal": 30, "health": 45, "finance": 30,
-            "learning": 60, "travel": 120, "home": 60, "other": 45
-        }
-        base = base_durations.get(category, 45)
-        multiplier = 1.0
-        text_lower = text.lower()
+        base = BASE_DURATIONS.get(category, 45)
+        multiplier = _multiplier_matcher.first(text, 1.0)
 
-        for keyword, factor in {
-            "quick": 0.3, "fast": 0.3, "brief": 0.4,
-            "standard": 1.0, "complete": 1.7, "deep": 2.0
-        }.items():
-            if keyword in text_lower:
-                multiplier = factor
-                break
-
-        for keyword, mins in {
-            "email": 15, "call": 20, "meeting": 60,
-            "report": 120, "project": 180, "shopping": 60,
-            "study": 90, "doctor": 60
-        }.items():
-            if keyword in text_lower:
-                return max(int(mins * multiplier), 10)
-
-        for pattern in [r'(\d+)\s*(minutes?|mins?)', r'(\d+)\s*(hours?|hrs?)']:
-            match = re.search(pattern, text_lower)
+        mins = _duration_matcher.first(text)
+        if mins is not None:
+            return max(int(mins * multiplier), 10)
+
+        text_lower = text.lower()
+        for pattern in DURATION_PATTERNS:
+            match = pattern.search(text_lower)
             if match:
                 val = int(match.group(1))
                 return max(val * (60 if 'hour' in match.group(2) else 1), 10)
@@ -64,54 +104,67 @@ class AdvancedTaskAgent:
         return max(int(base * multiplier), 10)
 
     def generate_ai_suggestions(self, text, category):
-        text = text.lower()
-        suggest = {
-            "work": ["Prepare agenda", "Set reminders"],
-            "shopping": ["Make a list", "Compare prices"],
-            "health": ["Book appointment", "Bring ID"],
-            "finance": ["Check balance", "Keep docs ready"]
-        }
-        suggestions = suggest.get(category, [])
+        suggestions = list(CATEGORY_SUGGESTIONS.get(category, ()))
         if len(text.split()) > 8:
             suggestions.append("Break into subtasks")
         return suggestions[:3]
 
+    def warmup(self):
+        """
+        Run one throwaway parse so spaCy, the categorizer and the date and
+        keyword regexes are loaded before the first real task. Returns the
+        seconds it took.
+        """
+        start = time.perf_counter()
+        self.parse_advanced_natural_language(WARMUP_TEXT)
+        return time.perf_counter() - start
+
+    def keyword_categorize(self, text):
+        return self.category_matcher.first(text, "personal")
+
     def smart_categorize(self, text):
-        text_lower = text.lower()
+        return self.smart_categorize_many([text])[0]
+
+    def smart_categorize_many(self, texts):
+        """Categorize a batch of texts with a single transform/predict call."""
+        return [category for category, _ in self.categorize_with_confidence(texts)]
+
+    def categorize_with_confidence(self, texts):
+        """
+        Return (category, confidence) for each text. Confidence is the model's
+        top-class probability; it is None when the keyword rules decided,
+        either because no trained model exists or because the model was less
+        sure than CONFIDENCE_THRESHOLD and a keyword matched.
+        """
+        cleaned = [normalize_task_text(text) for text in texts]
         try:
-            with open('models/task_categorizer_model.pkl', 'rb') as f:
-                model = pickle.load(f)
-            with open('models/tfidf_vectorizer.pkl', 'rb') as f:
-                vectorizer = pickle.load(f)
-            features = vectorizer.transform([re.sub(r'[^a-zA-Z\s]', '', text_lower)])
-            return model.predict(features)[0]
-        except:
-            for category, keywords in self.categories.items():
-                if any(word in text_lower for word in keywords):
-                    return category
-            return "personal"
+            predictions = model_registry.predict_with_confidence(cleaned)
+        except model_registry.ModelUnavailable:
+            return [(self.keyword_categorize(text), None) for text in texts]
 
-    def parse_advanced_natural_language(self, input_str, forced_category=None, forced_priority=None):
-        due_time = re.search(r'(\d{1,2})(:\d{2})?\s*(am|pm)', input_str, re.I)
-        due_date = parse_date_expressions(input_str)
-
-        if due_time:
-            hour = int(due_time.group(1)) % 12
-            minute = int(due_time.group(2)[1:]) if due_time.group(2) else 0
-            if due_time.group(3).lower() == 'pm' and hour != 12:
-                hour += 12
-            due_date = due_date.replace(hour=hour, minute=minute)
-        else:
+        results = []
+        for text, (label, confidence) in zip(texts, predictions):
+            if confidence is not None and confidence < CONFIDENCE_THRESHOLD:
+                keyword_category = self.category_matcher.first(text)
+                if keyword_category is not None:
+                    results.append((keyword_category, None))
+                    continue
+            results.append((label, confidence))
+        return results
+
+    def _build_task(self, input_str, category, doc, forced_priority=None):
+        due_date, has_time = parse_datetime(input_str)
+        if not has_time:
             due_date = due_date.replace(hour=23, minute=59)
 
-        category = forced_category or self.smart_categorize(input_str)
         duration = self.estimate_duration(input_str, category)
         suggestions = self.generate_ai_suggestions(input_str, category)
-        entities = self.extract_entities(input_str)
+        entities = self.extract_entities(input_str, doc=doc)
 
+        text_lower = input_str.lower()
         priority = forced_priority or (
-            "high" if any(x in input_str.lower() for x in ["urgent", "asap"]) else
-            "medium" if any(x in input_str.lower() for x in ["important", "priority"]) else
+            "high" if any(x in text_lower for x in HIGH_PRIORITY_WORDS) else
+            "medium" if any(x in text_lower for x in MEDIUM_PRIORITY_WORDS) else
             "low"
         )
 
@@ -121,8 +174,57 @@ class AdvancedTaskAgent:
             "priority": priority,
             "due_date": due_date.strftime('%Y-%m-%d %H:%M:%S'),
             "status": "pending",
-            "tags": extract_tags(input_str),
+            "tags": extract_tags(input_str, doc=doc),
             "estimated_duration": duration,
             "ai_suggestions": json.dumps(suggestions),
             "context_keywords": " ".join(entities)
         }
+
+    def parse_advanced_natural_language(self, input_str, forced_category=None, forced_priority=None):
+        category = forced_category or self.smart_categorize(input_str)
+        # One spaCy pass shared by entity and tag extraction
+        doc = nlp_doc(input_str)
+        return self._build_task(input_str, category, doc, forced_priority)
+
+    def parse_many(self, input_strs, forced_category=None, forced_priority=None):
+        """
+        Parse a batch of raw task strings. Categorization runs as one vectorized
+        predict and spaCy processes the texts with nlp.pipe.
+        """
+        texts = [text for text in input_strs if text and text.strip()]
+        if not texts:
+            return []
+
+        if forced_category:
+            categories = [forced_category] * len(texts)
+        else:
+            categories = self.smart_categorize_many(texts)
+        docs = nlp_docs(texts)
+
+        return [
+            self._build_task(text, category, doc, forced_priority)
+            for text, category, doc in zip(texts, categories, docs)
+        ]
+
+
+def _warmup_in_background(agent):
+    try:
+        agent.warmup()
+    except Exception as e:
+        print(f"[agent] Warm-up failed: {e}")
+
+
+@st.cache_resource
+def init_agent():
+    agent = AdvancedTaskAgent()
+    threading.Thread(target=_warmup_in_background, args=(agent,), name="agent-warmup", daemon=True).start()
+    return agent
+
+
+def get_agent():
+    """
+    The agent shared by every Streamlit session and rerun, built once per
+    server process with st.cache_resource. Its warm-up parse runs on a
+    background thread so building it never delays a page.
+    """
+    return init_agent()
@@ -1,18 +1,103 @@
 # analytics.py
+from datetime import datetime
+
 import streamlit as st
 import plotly.express as px
-import matplotlib.pyplot as plt
 from wordcloud import WordCloud
-from database import get_tasks_analytics, get_smart_recommendations, get_all_tasks
+from database import (
+    get_task_metrics, get_tasks_analytics, get_smart_recommendations,
+    get_daily_rollups, get_category_rollups, data_generation, READ_CACHE_SECONDS,
+    get_top_terms, get_top_terms_by_category, get_trending_terms
+)
+
+TREND_DAYS = 30
+# WordCloud draws at most 200 words by default
+WORD_CLOUD_TERMS = 200
+TRENDING_TERM_DAYS = 7
+
+# Figures and the word cloud are built once per data generation (bumped by
+# every task write, see database.data_generation) and shared by all
+# sessions, so a repeat view of the dashboard only re-sends them. Like the
+# read cache they expire after READ_CACHE_SECONDS, for writes made by
+# other processes.
+FIGURE_CACHE_ENTRIES = 4
+
+
+def _figure_cache(func):
+    return st.cache_resource(show_spinner=False, max_entries=FIGURE_CACHE_ENTRIES, ttl=READ_CACHE_SECONDS)(func)
+
+
+@_figure_cache
+def category_figure(generation):
+    metrics = get_task_metrics()
+    cat_counts = sorted(metrics["open_by_category"].items(), key=lambda kv: kv[1], reverse=True)
+    return px.pie(
+        values=[count for _, count in cat_counts],
+        names=[category for category, _ in cat_counts],
+        title="Tasks by Category"
+    )
+
+
+@_figure_cache
+def priority_figure(generation):
+    metrics = get_task_metrics()
+    prio_counts = sorted(metrics["open_by_priority"].items(), key=lambda kv: kv[1], reverse=True)
+    return px.bar(
+        x=[priority for priority, _ in prio_counts],
+        y=[count for _, count in prio_counts],
+        title="Tasks by Priority",
+        color=[priority for priority, _ in prio_counts],
+        color_discrete_map={"high": "red", "medium": "orange", "low": "green"}
+    )
+
+
+@_figure_cache
+def trend_figures(generation, day):
+    """(created vs completed line, completed-by-category bar) for the TREND_DAYS up to `day`; None when empty."""
+    daily = get_daily_rollups(TREND_DAYS)
+    if daily.empty:
+        return None, None
+    fig_trend = px.line(
+        daily, x="date", y=["created_tasks", "completed_tasks"],
+        title="Tasks Created vs Completed", markers=True
+    )
+    by_category = get_category_rollups(TREND_DAYS)
+    fig_perf = None
+    if not by_category.empty:
+        fig_perf = px.bar(
+            by_category, x="category", y="completed_tasks",
+            title="Completed Tasks by Category"
+        )
+    return fig_trend, fig_perf
+
+
+@_figure_cache
+def task_term_frequencies(generation):
+    """Word -> count over open task names, read from the term-frequency index."""
+    return dict(get_top_terms(WORD_CLOUD_TERMS, open_only=True))
+
+
+@_figure_cache
+def word_cloud_image(generation):
+    """The word cloud as an RGB array, or None when there is no text."""
+    frequencies = task_term_frequencies(generation)
+    if not frequencies:
+        return None
+    wc = WordCloud(width=800, height=400, background_color='white')
+    return wc.generate_from_frequencies(frequencies).to_array()
 
 
 def create_advanced_dashboard():
     st.header("📊 Task Analytics Dashboard")
-    analytics = get_tasks_analytics()
-    recommendations = get_smart_recommendations()
-    all_tasks_df = get_all_tasks()
+    try:
+        metrics = get_task_metrics()
+    except Exception as e:
+        st.error(f"Analytics error: {e}")
+        return
+    analytics = get_tasks_analytics(metrics)
+    recommendations = get_smart_recommendations(metrics)
 
-    if all_tasks_df.empty:
+    if not metrics["open_tasks"]:
         st.info("No tasks available to analyze.")
         return
 
@@ -27,39 +112,50 @@ def create_advanced_dashboard():
     col3.metric("Pending", analytics.get("pending_tasks", 0))
     col4.metric("Overdue", analytics.get("overdue_tasks", 0))
 
+    generation = data_generation()
+
     st.subheader("📁 Category Distribution")
-    cat_counts = all_tasks_df['category'].value_counts()
-    fig_cat = px.pie(values=cat_counts.values, names=cat_counts.index, title="Tasks by Category")
-    st.plotly_chart(fig_cat, use_container_width=True)
+    st.plotly_chart(category_figure(generation), width="stretch")
 
     st.subheader("🎯 Priority Distribution")
-    prio_counts = all_tasks_df['priority'].value_counts()
-    fig_prio = px.bar(
-        x=prio_counts.index,
-        y=prio_counts.values,
-        title="Tasks by Priority",
-        color=prio_counts.index,
-        color_discrete_map={"high": "red", "medium": "orange", "low": "green"}
-    )
-    st.plotly_chart(fig_prio, use_container_width=True)
+    st.plotly_chart(priority_figure(generation), width="stretch")
 
     st.subheader("⏰ Time Estimation")
     col5, col6 = st.columns(2)
     col5.metric("Total Time (min)", analytics.get("total_estimated_time", 0))
-    avg_time = all_tasks_df['estimated_duration'].mean()
+    avg_time = metrics["average_open_duration"]
     col6.metric("Average per Task (min)", f"{avg_time:.1f}")
 
+    st.subheader(f"📈 Trends (last {TREND_DAYS} days)")
+    # The trend window moves with the (UTC) day as well as with the data
+    fig_trend, fig_perf = trend_figures(generation, datetime.utcnow().strftime('%Y-%m-%d'))
+    if fig_trend is None:
+        st.info("No activity recorded yet.")
+    else:
+        st.plotly_chart(fig_trend, width="stretch")
+        if fig_perf is not None:
+            st.plotly_chart(fig_perf, width="stretch")
+
     st.subheader("📝 Task Word Cloud")
-    text = " ".join(all_tasks_df['task_name'].astype(str))
-    if text.strip():
-        wc = WordCloud(width=800, height=400, background_color='white').generate(text)
-        fig, ax = plt.subplots(figsize=(10, 4))
-        ax.imshow(wc, interpolation='bilinear')
-        ax.axis('off')
-        st.pyplot(fig)
+    image = word_cloud_image(generation)
+    if image is not None:
+        st.image(image, width="stretch")
     else:
         st.info("No text available to generate word cloud.")
-    recommendations = get_smart_recommendations()
+
+    st.subheader("🔤 Keywords")
+    col7, col8 = st.columns(2)
+    with col7:
+        st.markdown(f"**Trending (last {TRENDING_TERM_DAYS} days vs the {TRENDING_TERM_DAYS} before)**")
+        trending = get_trending_terms(TRENDING_TERM_DAYS)
+        if trending:
+            st.table([{"term": term, "recent": recent, "before": previous} for term, recent, previous in trending])
+        else:
+            st.caption("No tasks created recently.")
+    with col8:
+        st.markdown("**Top terms per category**")
+        for category, terms in get_top_terms_by_category(5).items():
+            st.caption(f"{category}: " + ", ".join(f"{term} ({count})" for term, count in terms))
 
     if recommendations:
         st.subheader("🎯 Smart Recommendations")
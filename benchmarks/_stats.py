@@ -0,0 +1,129 @@
+# benchmarks/_stats.py
+"""Shared helpers for the benchmark scripts: timing summaries and baselines."""
+import json
+import math
+import os
+import platform
+import sys
+import time
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(seconds):
+    """p50/p95/p99/mean/max in milliseconds for a list of durations in seconds."""
+    values = sorted(seconds)
+    if not values:
+        return {"count": 0}
+    ms = lambda v: round(v * 1000, 4)
+    return {
+        "count": len(values),
+        "p50_ms": ms(percentile(values, 0.50)),
+        "p95_ms": ms(percentile(values, 0.95)),
+        "p99_ms": ms(percentile(values, 0.99)),
+        "mean_ms": ms(sum(values) / len(values)),
+        "max_ms": ms(values[-1]),
+    }
+
+
+class Timer:
+    """Context manager that appends its elapsed time to a list."""
+
+    def __init__(self, sink):
+        self.sink = sink
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.sink.append(time.perf_counter() - self.start)
+
+
+def environment():
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def write_report(report, path=None):
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if path:
+        with open(path, "w") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+def find_regressions(report, baseline, threshold, metrics=("p50_ms", "p95_ms"), min_ms=0.01):
+    """
+    Compare every timing summary in `report` with the same entry in
+    `baseline` (dicts of name -> summary) and list those that got slower than
+    baseline * threshold. Baselines under min_ms are too noisy to gate on.
+    """
+    regressions = []
+    for name, current in report.items():
+        previous = baseline.get(name)
+        if not isinstance(current, dict) or not isinstance(previous, dict):
+            continue
+        for metric in metrics:
+            new, old = current.get(metric), previous.get(metric)
+            if new is None or not old or old < min_ms:
+                continue
+            if new > old * threshold:
+                regressions.append(f"{name}.{metric}: {old} -> {new} ms (x{new / old:.2f})")
+    return regressions
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def timing_summaries(report, prefix=""):
+    """Every timing summary (a dict with p50_ms) in a report, keyed by its dotted path."""
+    found = {}
+    for key, value in report.items():
+        if not isinstance(value, dict):
+            continue
+        if "p50_ms" in value:
+            found[f"{prefix}{key}"] = value
+        else:
+            found.update(timing_summaries(value, f"{prefix}{key}."))
+    return found
+
+
+def add_report_args(parser):
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare against")
+    parser.add_argument("--max-regression", type=float, default=1.25,
+                        help="Fail if a timing is slower than baseline times this factor")
+
+
+def check_baseline(args, report, **options):
+    """
+    Compare report with the --baseline report, if one was given, and print
+    each regression to stderr. Returns 1 if anything regressed, else 0.
+    options are passed on to find_regressions.
+    """
+    if not args.baseline:
+        return 0
+    regressions = find_regressions(timing_summaries(report), timing_summaries(load_baseline(args.baseline)),
+                                   args.max_regression, **options)
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+def remove_db_files(path):
+    """Delete a scratch SQLite database along with its -wal and -shm files."""
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
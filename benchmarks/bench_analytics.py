@@ -0,0 +1,107 @@
+# benchmarks/bench_analytics.py
+"""
+Time the Analytics page on a scratch database of synthetic tasks.
+
+    python -m benchmarks.bench_analytics --sizes 1000 10000 100000 --output analytics.json
+
+For each size the dashboard is rendered with streamlit.testing's AppTest
+three ways: cold (figure and read caches emptied), a repeat view (caches
+warm), and a view right after one task write (new data generation). The
+word cloud as the page built it before it was cached (WordCloud.generate on
+the raw text, drawn with matplotlib) is timed for comparison.
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+import database
+from benchmarks._stats import (Timer, summarize, environment, write_report, add_report_args, check_baseline,
+                               remove_db_files)
+from benchmarks.synthetic import agent_categories, fill_database, sample_task
+
+DASHBOARD_SCRIPT = "import analytics\nanalytics.create_advanced_dashboard()\n"
+
+
+def render_dashboard():
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_string(DASHBOARD_SCRIPT, default_timeout=300).run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+
+def clear_caches():
+    import streamlit as st
+
+    st.cache_resource.clear()
+    database.invalidate_reads()
+
+
+def legacy_word_cloud():
+    """The uncached word cloud: tokenise every open task name and draw it with matplotlib."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from wordcloud import WordCloud
+
+    text = " ".join(str(name) for name in database.get_open_task_names())
+    wc = WordCloud(width=800, height=400, background_color='white').generate(text)
+    fig, ax = plt.subplots(figsize=(10, 4))
+    ax.imshow(wc, interpolation='bilinear')
+    ax.axis('off')
+    fig.savefig(io.BytesIO(), format="png")
+    plt.close(fig)
+
+
+def run_size(size, repeat, categories, workdir):
+    path = os.path.join(workdir, f"bench_analytics_{size}.db")
+    remove_db_files(path)
+    fill_database(database.use_database(path), size, categories)
+    database.backfill_rollups()
+    database.backfill_term_index()
+
+    rng = random.Random(size)
+    timings = {name: [] for name in ("cold_view", "repeat_view", "view_after_write", "legacy_word_cloud")}
+    for _ in range(repeat):
+        clear_caches()
+        with Timer(timings["cold_view"]):
+            render_dashboard()
+        with Timer(timings["repeat_view"]):
+            render_dashboard()
+        database.add_advanced_task(sample_task(categories, rng))
+        with Timer(timings["view_after_write"]):
+            render_dashboard()
+        with Timer(timings["legacy_word_cloud"]):
+            legacy_word_cloud()
+
+    database.close_database()
+    remove_db_files(path)
+    return {name: summarize(times) for name, times in timings.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Analytics dashboard")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workdir", default=tempfile.gettempdir())
+    add_report_args(parser)
+    args = parser.parse_args(argv)
+
+    categories = agent_categories()
+    start = time.perf_counter()
+    report = {
+        "benchmark": "analytics",
+        "environment": environment(),
+        "sizes": {str(size): run_size(size, args.repeat, categories, args.workdir) for size in args.sizes},
+    }
+    report["total_seconds"] = round(time.perf_counter() - start, 1)
+    write_report(report, args.output)
+    return check_baseline(args, report)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+# benchmarks/bench_concurrency.py
+"""
+Stress database.py from many threads at once, like concurrent Streamlit
+sessions plus the reminder scheduler.
+
+    python -m benchmarks.bench_concurrency --readers 16 --writers 4 --seconds 10
+
+Reader threads page through open tasks and compute dashboard metrics;
+writer threads add tasks and toggle task status. Every operation is timed
+and any failure ("database is locked", a write returning False) is
+counted. Exits non-zero if any operation failed.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+import database
+from benchmarks._stats import (Timer, summarize, environment, write_report, add_report_args, check_baseline,
+                               remove_db_files)
+from benchmarks.synthetic import agent_categories, fill_database, sample_task
+
+PAGE_SQL = database.OPEN_TASKS_SQL + " LIMIT 25"
+
+
+def _reader(stop, times, errors):
+    while not stop.is_set():
+        try:
+            with Timer(times):
+                database.get_connection().execute(PAGE_SQL).fetchall()
+                database.get_task_metrics()
+        except Exception as e:
+            errors.append(str(e))
+
+
+def _writer(stop, times, errors, categories, max_id, seed):
+    rng = random.Random(seed)
+    while not stop.is_set():
+        with Timer(times):
+            ok = (database.add_advanced_task(sample_task(categories, rng)) and
+                  database.update_task_status(rng.randint(1, max_id), rng.choice(("completed", "pending"))))
+        if not ok:
+            errors.append("write failed")
+
+
+def run(readers, writers, seconds, size, workdir):
+    path = os.path.join(workdir, "bench_concurrency.db")
+    remove_db_files(path)
+    categories = agent_categories()
+    fill_database(database.use_database(path), size, categories)
+    database.backfill_rollups()
+    database.backfill_term_index()
+
+    stop = threading.Event()
+    read_times, write_times, errors = [], [], []
+    threads = [threading.Thread(target=_reader, args=(stop, read_times, errors)) for _ in range(readers)]
+    threads += [
+        threading.Thread(target=_writer, args=(stop, write_times, errors, categories, size, seed))
+        for seed in range(writers)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    result = {
+        "readers": readers,
+        "writers": writers,
+        "seconds": seconds,
+        "tasks": size,
+        "reads_per_second": round(len(read_times) / seconds, 1),
+        "writes_per_second": round(len(write_times) / seconds, 1),
+        "read": summarize(read_times),
+        "write": summarize(write_times),
+        "errors": len(errors),
+        "first_errors": sorted(set(errors))[:5],
+        "connections": database.get_manager().get_stats(),
+    }
+    database.close_database()
+    remove_db_files(path)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent read/write stress test for database.py")
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--size", type=int, default=10000, help="Tasks in the scratch database")
+    parser.add_argument("--workdir", default=tempfile.gettempdir())
+    add_report_args(parser)
+    args = parser.parse_args(argv)
+
+    result = run(args.readers, args.writers, args.seconds, args.size, args.workdir)
+    report = {"benchmark": "concurrency", "environment": environment(), **result}
+    write_report(report, args.output)
+
+    status = check_baseline(args, report)
+    return 1 if result["errors"] else status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+# benchmarks/bench_database.py
+"""
+Benchmark database.py against scratch SQLite files of growing size.
+
+    python -m benchmarks.bench_database --sizes 10000 100000 1000000 --output db.json
+
+For each size a fresh file is filled with synthetic tasks across the agent's
+categories and priorities, then every read and write function is timed.
+Reads are timed against SQLite (read cache emptied first) and again from
+the cache, and also report the memory held by the DataFrame they return.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+import database
+from benchmarks._stats import (Timer, summarize, environment, write_report, add_report_args, check_baseline,
+                               remove_db_files)
+from benchmarks.synthetic import agent_categories, fill_database, sample_task
+
+
+def _result_bytes(result):
+    if isinstance(result, pd.DataFrame):
+        return int(result.memory_usage(deep=True).sum())
+    return None
+
+
+def time_reads(repeat):
+    page = database.DEFAULT_PAGE_SIZE
+    reads = {
+        "get_all_tasks": database.get_all_tasks,
+        "get_overdue_tasks": database.get_overdue_tasks,
+        "get_completed_tasks": database.get_completed_tasks,
+        "get_tasks_analytics": database.get_tasks_analytics,
+        "get_smart_recommendations": database.get_smart_recommendations,
+        "get_task_page_open": lambda: database.get_task_page("open", limit=page),
+        "query_tasks_filtered": lambda: database.query_tasks(priority="high", category="work", limit=page),
+        "count_tasks_open": lambda: database.count_tasks("open"),
+        "get_daily_rollups": database.get_daily_rollups,
+        "get_top_terms": lambda: database.get_top_terms(50),
+        "get_top_terms_by_category": database.get_top_terms_by_category,
+        "get_trending_terms": database.get_trending_terms,
+    }
+    results, cached = {}, {}
+    for name, fn in reads.items():
+        times, cached_times = [], []
+        result = None
+        for _ in range(repeat):
+            # Cold: the read cache is emptied first, so SQLite answers
+            database.invalidate_reads()
+            with Timer(times):
+                result = fn()
+            with Timer(cached_times):
+                fn()
+        summary = summarize(times)
+        summary["rows"] = len(result) if hasattr(result, "__len__") else None
+        summary["result_bytes"] = _result_bytes(result)
+        results[name] = summary
+        cached[name] = summarize(cached_times)
+    return results, cached
+
+
+def time_writes(repeat, categories, seed=7):
+    rng = random.Random(seed)
+    db = database.get_connection()
+    max_id = db.execute("SELECT MAX(task_id) FROM tasks").fetchone()[0] or 1
+    timings = {name: [] for name in ("add_advanced_task", "update_task_status", "update_task", "delete_task")}
+
+    for _ in range(repeat):
+        with Timer(timings["add_advanced_task"]):
+            database.add_advanced_task(sample_task(categories, rng))
+
+        task_id = rng.randint(1, max_id)
+        with Timer(timings["update_task_status"]):
+            database.update_task_status(task_id, rng.choice(("completed", "pending")))
+
+        task = sample_task(categories, rng)
+        with Timer(timings["update_task"]):
+            database.update_task(
+                rng.randint(1, max_id), task["task_name"], task["category"], task["priority"],
+                task["due_date"], task["tags"], task["estimated_duration"],
+                task["ai_suggestions"], task["context_keywords"]
+            )
+
+        with Timer(timings["delete_task"]):
+            database.delete_task(rng.randint(1, max_id))
+    return {name: summarize(times) for name, times in timings.items()}
+
+
+def run_size(size, repeat, write_repeat, categories, workdir, keep=False):
+    path = os.path.join(workdir, f"bench_tasks_{size}.db")
+    remove_db_files(path)
+    db = database.use_database(path)
+
+    start = time.perf_counter()
+    fill_database(db, size, categories)
+    database.backfill_rollups()
+    database.backfill_term_index()
+    db.execute("ANALYZE")
+    fill_seconds = time.perf_counter() - start
+
+    reads, reads_cached = time_reads(repeat)
+    result = {
+        "fill_seconds": round(fill_seconds, 2),
+        "file_bytes": os.path.getsize(path),
+        "reads": reads,
+        "reads_cached": reads_cached,
+        "writes": time_writes(write_repeat, categories),
+    }
+    database.close_database()
+    if not keep:
+        remove_db_files(path)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark database.py on synthetic data")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per read function")
+    parser.add_argument("--write-repeat", type=int, default=50, help="Runs per write function")
+    parser.add_argument("--workdir", default=tempfile.gettempdir())
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch database files")
+    add_report_args(parser)
+    args = parser.parse_args(argv)
+
+    categories = agent_categories()
+    report = {
+        "benchmark": "database",
+        "environment": environment(),
+        "sizes": {
+            str(size): run_size(size, args.repeat, args.write_repeat, categories, args.workdir, args.keep)
+            for size in args.sizes
+        },
+    }
+    write_report(report, args.output)
+
+    return check_baseline(args, report)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+# benchmarks/bench_dates.py
+"""
+Compare date_parser.parse_datetime with the original multi-scan parser.
+
+    python -m benchmarks.bench_dates --repeat 20 --min-speedup 3
+
+The legacy implementation below is the parser utils.parse_date_expressions
+shipped before date_parser existed, plus the separate time-of-day regex
+that parse_advanced_natural_language ran after it. Both run over
+unique_tasks_dataset.csv; the script exits non-zero if the new parser is
+not at least --min-speedup times faster.
+"""
+import argparse
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+
+from benchmarks._stats import environment, write_report
+from benchmarks.bench_parsing import load_corpus
+from date_parser import parse_datetime
+
+
+def legacy_parse(text):
+    base = datetime.now()
+    lowered = text.lower()
+    result = None
+    for pat in [r'(\d{1,2})[/-](\d{1,2})[/-](\d{2,4})', r'(\d{4})[/-](\d{1,2})[/-](\d{1,2})']:
+        match = re.search(pat, lowered)
+        if match:
+            try:
+                g = list(map(int, match.groups()))
+                if g[0] > 31:
+                    result = datetime(g[0], g[1], g[2])
+                elif g[2] > 31:
+                    result = datetime(g[2], g[1], g[0])
+                else:
+                    result = datetime(2000 + g[2], g[1], g[0])
+                break
+            except ValueError:
+                continue
+    if result is None:
+        relative = {"today": 0, "tomorrow": 1, "day after tomorrow": 2, "next week": 7, "next month": 30}
+        for key, offset in relative.items():
+            if key in lowered:
+                result = base + timedelta(days=offset)
+                break
+    if result is None:
+        for m in re.finditer(r'in (\d+) days?', lowered):
+            result = base + timedelta(days=int(m.group(1)))
+            break
+    if result is None:
+        days = {"monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
+                "friday": 4, "saturday": 5, "sunday": 6}
+        for name, num in days.items():
+            if name in lowered:
+                result = base + timedelta(days=(num - base.weekday() + 7) % 7)
+                break
+    if result is None:
+        result = base + timedelta(days=1)
+    due_time = re.search(r'(\d{1,2})(:\d{2})?\s*(am|pm)', text, re.I)
+    return result, due_time is not None
+
+
+def time_parser(parse, texts, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            parse(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the date/time parser")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--min-speedup", type=float, default=3.0)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    texts = load_corpus()
+    legacy = time_parser(legacy_parse, texts, args.repeat)
+    current = time_parser(parse_datetime, texts, args.repeat)
+    report = {
+        "benchmark": "dates",
+        "environment": environment(),
+        "corpus_size": len(texts),
+        "legacy_us_per_task": round(legacy / len(texts) * 1e6, 3),
+        "single_pass_us_per_task": round(current / len(texts) * 1e6, 3),
+        "speedup": round(legacy / current, 2),
+    }
+    write_report(report, args.output)
+    return 0 if report["speedup"] >= args.min_speedup else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+# benchmarks/bench_email_delivery.py
+"""
+Exercise the email delivery worker against a local stub of the Brevo API.
+
+    python -m benchmarks.bench_email_delivery --messages 500 --batch-size 50 --fail-rate 0.2
+
+The stub answers 201 for most requests and a configurable share of 429/503
+responses, so retries, batching and latency reporting can be checked
+without sending real email. tests/test_email_delivery.py drives the same
+stub with a fixed script of responses.
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from email_delivery import DeliveryWorker
+
+
+class StubBrevoHandler(BaseHTTPRequestHandler):
+    fail_rate = 0.0
+    latency = 0.0
+    # (status, headers) answers for the next requests, in order; None means
+    # answer normally
+    script = []
+    received = []
+    # Message versions in each request, failed ones included
+    requests = []
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        payload = json.loads(body)
+        versions = payload.get("messageVersions") or [{"to": payload["to"]}]
+        with self.lock:
+            self.requests.append(len(versions))
+            scripted = self.script.pop(0) if self.script else None
+        time.sleep(self.latency)
+
+        if scripted is not None:
+            status, headers = scripted
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            return
+
+        if random.random() < self.fail_rate:
+            status = random.choice([429, 503])
+            self.send_response(status)
+            if status == 429:
+                self.send_header("Retry-After", "0")
+            self.end_headers()
+            return
+
+        with self.lock:
+            self.received.extend(v["to"][0]["email"] for v in versions)
+        self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(json.dumps({"messageIds": [f"<{i}@stub>" for i in range(len(versions))]}).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub_server(fail_rate=0.0, latency=0.0, script=()):
+    """
+    Start the stub on a free local port and return (server, url). Each
+    server gets its own handler class, so server.RequestHandlerClass.received
+    and .requests only see that server's traffic.
+    """
+    handler = type("StubBrevoHandler", (StubBrevoHandler,), {
+        "fail_rate": fail_rate,
+        "latency": latency,
+        "script": list(script),
+        "received": [],
+        "requests": [],
+        "lock": threading.Lock(),
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/v3/smtp/email"
+
+
+def run(messages, batch_size, fail_rate, latency, workers):
+    server, url = start_stub_server(fail_rate, latency)
+    worker = DeliveryWorker(api_key="stub", api_url=url, max_workers=workers,
+                            backoff_seconds=0.01, max_retries=6)
+    batch = [
+        {"recipient_email": f"user{i}@example.com", "subject": f"Reminder {i}", "html_content": "<p>hi</p>"}
+        for i in range(messages)
+    ]
+
+    start = time.perf_counter()
+    futures = [worker.submit(batch[i:i + batch_size]) for i in range(0, messages, batch_size)]
+    failed = sum(1 for future in futures for error in future.result() if error is not None)
+    elapsed = time.perf_counter() - start
+
+    worker.close()
+    server.shutdown()
+    result = worker.stats()
+    result.update({
+        "messages": messages,
+        "batch_size": batch_size,
+        "fail_rate": fail_rate,
+        "failed_messages": failed,
+        "delivered_to_stub": len(set(server.RequestHandlerClass.received)),
+        "seconds": round(elapsed, 3),
+        "messages_per_second": round(messages / elapsed, 1) if elapsed else None,
+    })
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--fail-rate", type=float, default=0.1)
+    parser.add_argument("--latency", type=float, default=0.005, help="Stub response delay in seconds")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    result = run(args.messages, args.batch_size, args.fail_rate, args.latency, args.workers)
+    print(json.dumps(result, indent=2))
+    return 1 if result["delivered_to_stub"] != args.messages else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
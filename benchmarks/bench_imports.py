@@ -0,0 +1,126 @@
+# benchmarks/bench_imports.py
+"""
+Import-time profile of the Streamlit app and time to first paint.
+
+    python -m benchmarks.bench_imports --output imports.json
+    python -m benchmarks.bench_imports --baseline imports.json --max-regression 1.25
+
+Each scenario runs `python -X importtime -c <imports>` in a fresh subprocess
+and reports total import time plus the slowest packages. First paint is
+the first streamlit.testing AppTest run of main.py (default page).
+Exits non-zero if `import main` loads any module in HEAVY, or with
+--baseline if a timing grew by more than the allowed factor.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+from benchmarks._stats import environment, write_report, add_report_args, check_baseline
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What each page imports on top of main (see main.main)
+SCENARIOS = {
+    "main": "import main",
+    "add_task": "import main, agent, ui_components",
+    "overdue": "import main, ui_components",
+    "analytics": "import main, analytics",
+}
+
+# Modules that must only be imported by the page that needs them. Streamlit
+# itself imports the top-level plotly package, so plotly.express is checked.
+HEAVY = ("spacy", "pandas", "plotly.express", "matplotlib", "wordcloud", "apscheduler", "requests", "sklearn")
+
+FIRST_PAINT = (
+    "import time; from streamlit.testing.v1 import AppTest; "
+    "s = time.perf_counter(); at = AppTest.from_file({path!r}, default_timeout=120).run(); "
+    "t = time.perf_counter() - s; assert not at.exception, at.exception; print(t)"
+)
+
+# import time: self [us] | cumulative | imported package
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def _python(code, *flags):
+    return subprocess.run([sys.executable, *flags, "-c", code], cwd=ROOT, check=True,
+                          capture_output=True, text=True)
+
+
+def import_profile(code):
+    """Parse -X importtime output into {module: (self_us, cumulative_us, depth)}."""
+    modules = {}
+    for line in _python(code, "-X", "importtime").stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules[name] = (int(self_us), int(cumulative_us), len(indent) // 2)
+    return modules
+
+
+def summarize_profile(modules, top):
+    """Total import time and the `top` packages by self time summed over their submodules."""
+    total = sum(self_us for self_us, _, _ in modules.values())
+    packages = {}
+    for name, (self_us, _, _) in modules.items():
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+    slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+    return {
+        "total_ms": round(total / 1000, 1),
+        "modules": len(modules),
+        "top": {name: round(self_us / 1000, 1) for name, self_us in slowest[:top]},
+        "heavy": sorted(p for p in HEAVY if p in modules),
+    }
+
+
+def first_paint_ms(repeat):
+    code = FIRST_PAINT.format(path=os.path.join(ROOT, "main.py"))
+    with tempfile.TemporaryDirectory() as scratch:
+        # A scratch database, so the app's own file is never migrated or written
+        env = dict(os.environ, ONLINE_LEARNING="0", TASKS_DB_PATH=os.path.join(scratch, "tasks.db"))
+        times = [
+            float(subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, check=True,
+                                 capture_output=True, text=True).stdout.split()[-1])
+            for _ in range(repeat)
+        ]
+    return round(min(times) * 1000, 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile app import time and first paint")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario; the fastest is kept")
+    parser.add_argument("--top", type=int, default=10, help="Slowest packages to list per scenario")
+    parser.add_argument("--skip-first-paint", action="store_true")
+    add_report_args(parser)
+    args = parser.parse_args(argv)
+
+    timings = {}
+    profiles = {}
+    for name, code in SCENARIOS.items():
+        runs = [summarize_profile(import_profile(code), args.top) for _ in range(args.repeat)]
+        profiles[name] = min(runs, key=lambda run: run["total_ms"])
+        timings[f"import_{name}"] = {"p50_ms": profiles[name]["total_ms"]}
+    if not args.skip_first_paint:
+        timings["first_paint"] = {"p50_ms": first_paint_ms(args.repeat)}
+
+    report = {
+        "benchmark": "imports",
+        "environment": environment(),
+        "timings": timings,
+        "profiles": profiles,
+    }
+    write_report(report, args.output)
+
+    status = 0
+    if profiles["main"]["heavy"]:
+        print(f"import main loads heavy modules: {', '.join(profiles['main']['heavy'])}")
+        status = 1
+    # Import times are single wall-clock numbers, so only p50 and a coarse floor
+    return check_baseline(args, report, metrics=("p50_ms",), min_ms=5) or status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
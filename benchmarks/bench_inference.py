@@ -0,0 +1,96 @@
+# benchmarks/bench_inference.py
+"""
+Compare the sklearn categorizer artifact with its NumPy-only linear export.
+
+    python mlmodel.py --export-linear
+    python -m benchmarks.bench_inference --repeat 5
+
+Cold start (import + load + first prediction) is measured in fresh
+subprocesses; warm throughput and prediction agreement are measured over
+unique_tasks_dataset.csv. Exits non-zero if any prediction differs.
+"""
+import argparse
+import subprocess
+import sys
+import time
+
+from benchmarks._stats import environment, write_report
+from benchmarks.bench_parsing import load_corpus
+
+COLD_START = {
+    "sklearn": (
+        "import pickle, time; s = time.perf_counter(); "
+        "p = pickle.load(open({artifact!r}, 'rb'))['pipeline']; p.predict(['pay bills']); "
+        "print(time.perf_counter() - s)"
+    ),
+    "numpy": (
+        "import time; s = time.perf_counter(); "
+        "from linear_inference import LinearCategorizer; m = LinearCategorizer({linear!r}); "
+        "m.predict(m.transform(['pay bills'])); print(time.perf_counter() - s)"
+    ),
+}
+
+
+def cold_start_ms(backend, artifact, linear, repeat):
+    code = COLD_START[backend].format(artifact=artifact, linear=linear)
+    times = [
+        float(subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout)
+        for _ in range(repeat)
+    ]
+    return round(min(times) * 1000, 2)
+
+
+def main(argv=None):
+    import pickle
+
+    import mlmodel
+    from linear_inference import LinearCategorizer
+
+    parser = argparse.ArgumentParser(description="Benchmark sklearn vs NumPy categorizer inference")
+    parser.add_argument("--artifact", default="models/task_categorizer.pkl")
+    parser.add_argument("--linear", default="models/task_categorizer.npz")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    texts = [mlmodel.preprocess_text(text) for text in load_corpus()]
+    linear = LinearCategorizer(args.linear)
+    with open(args.artifact, 'rb') as f:
+        artifact = pickle.load(f)
+    pipeline = artifact["pipeline"]
+    if type(pipeline[-1]).__name__ != linear.metadata.get("model"):
+        # The artifact's best model is not linear; compare against the exported one
+        pipeline = None
+
+    report = {
+        "benchmark": "inference",
+        "environment": environment(),
+        "corpus_size": len(texts),
+        "model": linear.metadata.get("model"),
+        "cold_start_ms": {
+            backend: cold_start_ms(backend, args.artifact, args.linear, args.repeat)
+            for backend in COLD_START
+        },
+    }
+
+    batches = [texts[i:i + args.batch_size] for i in range(0, len(texts), args.batch_size)]
+    start = time.perf_counter()
+    predicted = [label for batch in batches for label in linear.predict(linear.transform(batch))]
+    report["numpy_tasks_per_second"] = round(len(texts) / (time.perf_counter() - start), 1)
+
+    if pipeline is not None:
+        start = time.perf_counter()
+        expected = [label for batch in batches for label in pipeline.predict(batch)]
+        report["sklearn_tasks_per_second"] = round(len(texts) / (time.perf_counter() - start), 1)
+        report["mismatches"] = sum(a != b for a, b in zip(expected, predicted))
+    else:
+        report["mismatches"] = None
+        report["note"] = f"artifact model is {type(artifact['pipeline'][-1]).__name__}; agreement not checked"
+
+    write_report(report, args.output)
+    return 1 if report["mismatches"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
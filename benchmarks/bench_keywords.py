@@ -0,0 +1,80 @@
+# benchmarks/bench_keywords.py
+"""
+Compare KeywordMatcher with a per-keyword substring scan as the vocabulary grows.
+
+    python -m benchmarks.bench_keywords --sizes 30 300 3000
+
+The agent's category keywords are padded with synthetic words to each size;
+both approaches then look up the first category for every corpus text.
+"""
+import argparse
+import random
+import string
+import sys
+import time
+
+from agent import CATEGORY_KEYWORDS
+from benchmarks._stats import environment, write_report
+from benchmarks.bench_parsing import load_corpus
+from keyword_matcher import KeywordMatcher
+
+
+def padded_groups(size, seed=0):
+    rng = random.Random(seed)
+    groups = {category: list(words) for category, words in CATEGORY_KEYWORDS.items()}
+    names = list(groups)
+    count = sum(len(words) for words in groups.values())
+    while count < size:
+        word = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 10)))
+        groups[rng.choice(names)].append(word)
+        count += 1
+    return groups
+
+
+def scan_categorize(groups, text):
+    text_lower = text.lower()
+    for category, keywords in groups.items():
+        if any(word in text_lower for word in keywords):
+            return category
+    return "personal"
+
+
+def best_time(fn, texts, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            fn(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(texts) * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark keyword matching against substring scans")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[30, 300, 3000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    texts = load_corpus()
+    results = []
+    for size in args.sizes:
+        groups = padded_groups(size)
+        start = time.perf_counter()
+        matcher = KeywordMatcher.from_groups(groups)
+        build_ms = (time.perf_counter() - start) * 1000
+        results.append({
+            "keywords": len(matcher.table),
+            "build_ms": round(build_ms, 2),
+            "scan_us_per_task": round(best_time(lambda t: scan_categorize(groups, t), texts, args.repeat), 3),
+            "matcher_us_per_task": round(best_time(lambda t: matcher.first(t, "personal"), texts, args.repeat), 3),
+        })
+
+    write_report({"benchmark": "keywords", "environment": environment(),
+                  "corpus_size": len(texts), "results": results}, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
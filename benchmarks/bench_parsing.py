@@ -0,0 +1,121 @@
+# benchmarks/bench_parsing.py
+"""
+Benchmark the natural-language parsing pipeline on unique_tasks_dataset.csv.
+
+    python -m benchmarks.bench_parsing --output parse.json
+    python -m benchmarks.bench_parsing --baseline parse.json --max-regression 1.25
+
+Reports p50/p95/p99 latency for each stage of
+AdvancedTaskAgent.parse_advanced_natural_language, end-to-end single-task
+latency, and tasks/second for single and batch (parse_many) modes. With
+--baseline, exits non-zero if any stage's p50 or p95 grew by more than the
+allowed factor.
+"""
+import argparse
+import csv
+import sys
+import time
+
+from benchmarks._stats import Timer, summarize, environment, write_report, add_report_args, check_baseline
+
+DATASET = "unique_tasks_dataset.csv"
+
+
+def load_corpus(path=DATASET, limit=None):
+    with open(path, newline="", encoding="utf-8") as f:
+        texts = [row["text"] for row in csv.DictReader(f)]
+    return texts[:limit] if limit else texts
+
+
+def bench_stages(agent, texts):
+    """Time each stage separately, in the order parse_advanced_natural_language runs them."""
+    from utils import parse_date_expressions, nlp_doc, extract_tags
+
+    stages = {name: [] for name in (
+        "parse_date_expressions", "smart_categorize", "estimate_duration",
+        "generate_ai_suggestions", "nlp_doc", "extract_entities", "extract_tags"
+    )}
+    for text in texts:
+        with Timer(stages["parse_date_expressions"]):
+            parse_date_expressions(text)
+        with Timer(stages["smart_categorize"]):
+            category = agent.smart_categorize(text)
+        with Timer(stages["estimate_duration"]):
+            agent.estimate_duration(text, category)
+        with Timer(stages["generate_ai_suggestions"]):
+            agent.generate_ai_suggestions(text, category)
+        with Timer(stages["nlp_doc"]):
+            doc = nlp_doc(text)
+        with Timer(stages["extract_entities"]):
+            agent.extract_entities(text, doc=doc)
+        with Timer(stages["extract_tags"]):
+            extract_tags(text, doc=doc)
+    return {name: summarize(times) for name, times in stages.items()}
+
+
+def bench_single(agent, texts):
+    times = []
+    start = time.perf_counter()
+    for text in texts:
+        with Timer(times):
+            agent.parse_advanced_natural_language(text)
+    elapsed = time.perf_counter() - start
+    summary = summarize(times)
+    summary["tasks_per_second"] = round(len(texts) / elapsed, 1)
+    return summary
+
+
+def bench_batch(agent, texts, batch_size):
+    times = []
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        with Timer(times):
+            agent.parse_many(texts[i:i + batch_size])
+    elapsed = time.perf_counter() - start
+    summary = summarize(times)
+    summary["batch_size"] = batch_size
+    summary["tasks_per_second"] = round(len(texts) / elapsed, 1)
+    return summary
+
+
+def run(limit=None, batch_size=64, warmup=20):
+    import model_registry
+    from agent import AdvancedTaskAgent
+
+    texts = load_corpus(limit=limit)
+    start = time.perf_counter()
+    agent = AdvancedTaskAgent()
+    init_seconds = time.perf_counter() - start
+
+    # Warm caches (model registry, spaCy) so the numbers are steady state
+    for text in texts[:warmup]:
+        agent.parse_advanced_natural_language(text)
+
+    timings = bench_stages(agent, texts)
+    timings["parse_single"] = bench_single(agent, texts)
+    timings["parse_batch"] = bench_batch(agent, texts, batch_size)
+    return {
+        "benchmark": "parsing",
+        "environment": environment(),
+        "corpus_size": len(texts),
+        "agent_init_ms": round(init_seconds * 1000, 2),
+        "spacy_loaded": agent.nlp is not None,
+        "timings": timings,
+        "categorizer": model_registry.get_stats(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the NL parsing pipeline")
+    parser.add_argument("--limit", type=int, help="Only use the first N texts of the corpus")
+    parser.add_argument("--batch-size", type=int, default=64)
+    add_report_args(parser)
+    args = parser.parse_args(argv)
+
+    report = run(limit=args.limit, batch_size=args.batch_size)
+    write_report(report, args.output)
+    return check_baseline(args, report)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+# benchmarks/bench_search.py
+"""
+Compare FTS5 task search with a LIKE '%term%' scan on scratch databases.
+
+    python -m benchmarks.bench_search --sizes 100000 1000000 --output search.json
+
+Each query fetches what the All Tasks page shows for a search: the first
+page of open matching tasks plus the total match count. FTS goes through
+database.search_tasks / count_search_results; the scan runs the equivalent
+LIKE query over task_name, tags and context_keywords. The read cache is
+emptied before every call. A handful of "needle" tasks give a rare term.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import database
+from benchmarks._stats import (Timer, summarize, environment, write_report, add_report_args, check_baseline,
+                               remove_db_files)
+from benchmarks.synthetic import agent_categories, fill_database
+
+QUERIES = ("groceries", "weekly review", "rev", "mon rep", "passport", "zebra")
+NEEDLES = ("Renew passport before the trip", "Passport photos", "Book passport appointment")
+
+
+def _like_sql(text, select):
+    clauses, params = [], []
+    for word in text.split():
+        clauses.append("(" + " OR ".join(f"{field} LIKE ?" for field in database.SEARCH_FIELDS) + ")")
+        params.extend([f"%{word}%"] * len(database.SEARCH_FIELDS))
+    return f"SELECT {select} FROM tasks WHERE {' AND '.join(clauses)} AND status != 'completed'", params
+
+
+def like_search(text, limit):
+    db = database.get_connection()
+    sql, params = _like_sql(text, "*")
+    rows = db.execute(sql + " ORDER BY due_date ASC, task_id ASC LIMIT ?", params + [limit]).fetchall()
+    sql, params = _like_sql(text, "COUNT(*)")
+    return rows, db.execute(sql, params).fetchone()[0]
+
+
+def fts_search(text, limit):
+    return database.search_tasks(text, limit=limit), database.count_search_results(text)
+
+
+def run_size(size, repeat, limit, categories, workdir):
+    path = os.path.join(workdir, f"bench_search_{size}.db")
+    remove_db_files(path)
+    db = database.use_database(path)
+    start = time.perf_counter()
+    fill_database(db, size, categories)
+    with db:
+        db.executemany(
+            "INSERT INTO tasks (task_name, category, priority, due_date, status, tags) "
+            "VALUES (?, 'travel', 'medium', '2030-01-01 09:00:00', 'pending', '')",
+            [(name,) for name in NEEDLES]
+        )
+    fill_seconds = time.perf_counter() - start
+
+    results = {}
+    for text in QUERIES:
+        timings = {"fts": [], "like": []}
+        counts = {}
+        for _ in range(repeat):
+            for method, search in (("fts", fts_search), ("like", like_search)):
+                database.invalidate_reads()
+                with Timer(timings[method]):
+                    _, counts[method] = search(text, limit)
+        fts, like = summarize(timings["fts"]), summarize(timings["like"])
+        results[text] = {
+            "fts": fts,
+            "like": like,
+            "fts_matches": counts["fts"],
+            "like_matches": counts["like"],
+            "speedup_p50": round(like["p50_ms"] / fts["p50_ms"], 1) if fts["p50_ms"] else None,
+        }
+
+    database.close_database()
+    file_bytes = os.path.getsize(path)
+    remove_db_files(path)
+    return {"fill_seconds": round(fill_seconds, 1), "file_bytes": file_bytes, "queries": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark FTS5 search against a LIKE scan")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=database.DEFAULT_PAGE_SIZE)
+    parser.add_argument("--workdir", default=tempfile.gettempdir())
+    add_report_args(parser)
+    args = parser.parse_args(argv)
+
+    categories = agent_categories()
+    report = {
+        "benchmark": "search",
+        "environment": environment(),
+        "sizes": {
+            str(size): run_size(size, args.repeat, args.limit, categories, args.workdir)
+            for size in args.sizes
+        },
+    }
+    write_report(report, args.output)
+    return check_baseline(args, report)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+# benchmarks/check_query_plans.py
+"""
+Assert that the hot task-list queries are answered from an index.
+
+    python -m benchmarks.check_query_plans
+
+Exits non-zero if any query falls back to a full table scan or a temporary
+sort, so schema or query changes that lose an index are caught early.
+"""
+import sqlite3
+import sys
+from datetime import datetime
+
+import database
+
+NOW = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+HOT_QUERIES = {
+    "get_all_tasks": (database.OPEN_TASKS_SQL, ()),
+    "get_completed_tasks": (database.COMPLETED_TASKS_SQL, ()),
+    "get_overdue_tasks": (database.OVERDUE_TASKS_SQL, (NOW,)),
+    "get_pending_tasks": (database.PENDING_TASKS_SQL, (NOW,)),
+    "get_top_terms": (database.TOP_TERMS_SQL.format(column="count"), (database.ALL_CATEGORIES, 50)),
+    "get_top_terms_open": (database.TOP_TERMS_SQL.format(column="open_count"), ("work", 50)),
+}
+
+
+def plan_problems(plan):
+    problems = []
+    for line in plan:
+        if line.startswith("SCAN tasks") and "INDEX" not in line:
+            problems.append(f"full table scan: {line}")
+        if "TEMP B-TREE" in line:
+            problems.append(f"temporary sort: {line}")
+    if not any("INDEX" in line for line in plan):
+        problems.append("no index used")
+    return problems
+
+
+def check(db=None):
+    db = db or sqlite3.connect(":memory:")
+    database.create_schema(db)
+
+    failures = {}
+    for name, (sql, params) in HOT_QUERIES.items():
+        plan = database.explain_query_plan(sql, params, db=db)
+        print(f"{name}: {' | '.join(plan)}")
+        problems = plan_problems(plan)
+        if problems:
+            failures[name] = problems
+    return failures
+
+
+def main():
+    failures = check()
+    for name, problems in failures.items():
+        for problem in problems:
+            print(f"FAIL {name}: {problem}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+# benchmarks/synthetic.py
+"""Synthetic task generators for filling scratch databases."""
+import json
+import random
+from datetime import datetime, timedelta
+
+PRIORITIES = ("high", "medium", "low")
+PRIORITY_WEIGHTS = (0.2, 0.5, 0.3)
+FILLER_WORDS = (
+    "weekly", "client", "family", "urgent", "draft", "final", "online", "team",
+    "monthly", "quick", "review", "plan", "notes", "update", "new", "old"
+)
+
+
+def agent_categories():
+    """The agent's category -> keyword table, so generated tasks look like parsed ones."""
+    from agent import CATEGORY_KEYWORDS
+    return {category: list(keywords) for category, keywords in CATEGORY_KEYWORDS.items()}
+
+
+def generate_task_rows(count, categories, seed=42, now=None, history_days=365):
+    """
+    Yield tuples in the column order of SYNTHETIC_INSERT_SQL. Tasks are
+    created over the last `history_days`, due up to 60 days either side of
+    their creation, and roughly a third are completed.
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now()
+    names = list(categories)
+    fmt = '%Y-%m-%d %H:%M:%S'
+    for _ in range(count):
+        category = rng.choice(names)
+        keyword = rng.choice(categories[category])
+        words = [keyword] + rng.sample(FILLER_WORDS, 3)
+        rng.shuffle(words)
+        created = now - timedelta(seconds=rng.randrange(history_days * 86400))
+        due = created + timedelta(minutes=rng.randrange(-60 * 1440, 60 * 1440))
+        completed = rng.random() < 0.35 and created < now
+        completed_at = created + timedelta(minutes=rng.randrange(1, 14 * 1440)) if completed else None
+        if completed_at and completed_at > now:
+            completed_at = now
+        yield (
+            " ".join(words).capitalize(),
+            category,
+            rng.choices(PRIORITIES, PRIORITY_WEIGHTS)[0],
+            due.strftime(fmt),
+            "completed" if completed else "pending",
+            " ".join("#" + w for w in words[:3]),
+            created.strftime(fmt),
+            rng.choice((15, 20, 30, 45, 60, 90, 120, 180)),
+            json.dumps(["Make a list"]),
+            "",
+            completed_at.strftime(fmt) if completed_at else None,
+        )
+
+
+SYNTHETIC_INSERT_SQL = """
+    INSERT INTO tasks (
+        task_name, category, priority, due_date, status, tags, created_at,
+        estimated_duration, ai_suggestions, context_keywords, completed_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def fill_database(db, count, categories, seed=42, chunk=50000):
+    """Bulk-insert `count` synthetic tasks into an open connection."""
+    rows = generate_task_rows(count, categories, seed=seed)
+    while True:
+        batch = [row for _, row in zip(range(chunk), rows)]
+        if not batch:
+            break
+        with db:
+            db.executemany(SYNTHETIC_INSERT_SQL, batch)
+
+
+def sample_task(categories, rng):
+    """A task dict in the shape AdvancedTaskAgent.parse_advanced_natural_language returns."""
+    category = rng.choice(list(categories))
+    return {
+        "task_name": f"{rng.choice(categories[category])} {rng.choice(FILLER_WORDS)}",
+        "category": category,
+        "priority": rng.choice(PRIORITIES),
+        "due_date": (datetime.now() + timedelta(days=rng.randrange(-10, 30))).strftime('%Y-%m-%d %H:%M:%S'),
+        "status": "pending",
+        "tags": "",
+        "estimated_duration": 30,
+        "ai_suggestions": "[]",
+        "context_keywords": "",
+    }
@@ -1,92 +1,472 @@
 # database.py
+import json
+import os
+import re
 import sqlite3
-import pandas as pd
-from datetime import datetime
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 import streamlit as st
 
+from term_index import task_terms
 
-import sqlite3
-import pandas as pd
-from datetime import datetime
+DB_PATH = os.environ.get("TASKS_DB_PATH", "advanced_tasks.db")
+
+# Applied to every connection. WAL lets readers run while a write commits;
+# synchronous=NORMAL is durable across application crashes in WAL mode
+# (only an OS crash can lose the last commits).
+BUSY_TIMEOUT_SECONDS = 5.0
+CONNECTION_PRAGMAS = {
+    "synchronous": "NORMAL",
+    "cache_size": -int(os.environ.get("SQLITE_CACHE_KB", "16384")),  # negative = KiB
+    "mmap_size": int(os.environ.get("SQLITE_MMAP_BYTES", str(256 * 1024 * 1024))),
+    "temp_store": "MEMORY",
+}
+
+# The process-wide ConnectionManager, initialized lazily
+_manager = None
+_manager_lock = threading.Lock()
+
+
+class ConnectionManager:
+    """
+    SQLite access for many threads (Streamlit sessions, the reminder
+    scheduler, the online learner). Each thread reads through its own
+    read-only connection; every write goes through one shared writer
+    connection, one transaction at a time.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.writer = self._connect()
+        self.writer.execute("PRAGMA journal_mode = WAL")
+        create_schema(self.writer)
+        self._write_lock = threading.Lock()
+        self._local = threading.local()
+        # [connection, owning thread]; a connection whose thread has exited
+        # is handed to the next new thread, since Streamlit runs every rerun
+        # on a fresh thread
+        self._readers = []
+        self._readers_lock = threading.Lock()
+        self.stats = {"writes": 0, "write_wait_ms_max": 0.0}
+
+    def _connect(self):
+        c = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SECONDS, check_same_thread=False)
+        for name, value in CONNECTION_PRAGMAS.items():
+            # PRAGMA cannot take a bound parameter
+            c.execute(f"PRAGMA {name} = {value}")
+        return c
+
+    def reader(self):
+        """This thread's read connection."""
+        c = getattr(self._local, "conn", None)
+        if c is None:
+            current = threading.current_thread()
+            with self._readers_lock:
+                for entry in self._readers:
+                    if not entry[1].is_alive():
+                        entry[1] = current
+                        c = entry[0]
+                        break
+                else:
+                    c = self._connect()
+                    c.execute("PRAGMA query_only = ON")
+                    self._readers.append([c, current])
+            self._local.conn = c
+        return c
+
+    @contextmanager
+    def write(self):
+        """
+        Serialized write transaction on the shared writer: commits when the
+        block exits, rolls back if it raises.
+        """
+        started = time.perf_counter()
+        with self._write_lock:
+            waited = (time.perf_counter() - started) * 1000
+            self.stats["write_wait_ms_max"] = max(self.stats["write_wait_ms_max"], round(waited, 2))
+            with self.writer:
+                yield self.writer
+            self.stats["writes"] += 1
+
+    def get_stats(self):
+        with self._readers_lock:
+            readers = len(self._readers)
+        return {"readers": readers, **self.stats}
+
+    def close(self):
+        with self._write_lock, self._readers_lock:
+            for c, _ in self._readers:
+                c.close()
+            self._readers = []
+            self.writer.close()
+
+
+@st.cache_resource
+def init_database(path):
+    return ConnectionManager(path)
+
+
+def get_manager():
+    """
+    Lazy-initialize the cached connection manager, creating tables and
+    applying migrations on first use.
+    """
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = init_database(DB_PATH)
+    return _manager
 
-# Global connection object to be initialized lazily
-conn = None
 
 def get_connection():
+    """The calling thread's read-only connection. Writes go through write_transaction()."""
+    return get_manager().reader()
+
+
+@contextmanager
+def write_transaction(invalidate=True):
     """
-    Lazy-initialize a cached database connection with table creation.
-    Ensures that st.cache_resource is only called after set_page_config.
+    Yield the writer connection inside a serialized transaction. Unless
+    invalidate is False (writes no cached read depends on), a successful
+    commit invalidates the read cache.
     """
-    global conn
-    if conn is None:
-        import streamlit as st
+    with get_manager().write() as db:
+        yield db
+    if invalidate:
+        invalidate_reads()
+
+
+# ---------------------------------------------------------------------------
+# Read cache
+#
+# Query results are cached per (SQL, parameters) and shared by every session.
+# Each committed task write bumps a generation counter and empties the
+# cache, so reads between writes never reach SQLite. Entries also expire
+# after READ_CACHE_SECONDS to pick up writes made by other processes (e.g.
+# task_cli.py). Failed queries raise before anything is cached.
+# ---------------------------------------------------------------------------
+
+READ_CACHE_SIZE = int(os.environ.get("READ_CACHE_SIZE", "256"))
+READ_CACHE_SECONDS = float(os.environ.get("READ_CACHE_SECONDS", "60"))
+
+_generation = 0
+_read_cache = OrderedDict()
+_read_cache_lock = threading.Lock()
+_read_cache_stats = {"hits": 0, "misses": 0}
+
+
+def data_generation():
+    """Counter bumped by every task write; use it to key anything derived from task data."""
+    return _generation
 
-        @st.cache_resource
-        def init_database():
-            c = sqlite3.connect("advanced_tasks.db", check_same_thread=False)
-            cur = c.cursor()
-
-            # Table for tasks
-            cur.execute('''
-                CREATE TABLE IF NOT EXISTS tasks (
-                    task_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    task_name TEXT,
-                    category TEXT,
-                    priority TEXT,
-                    due_date TEXT,
-                    status TEXT,
-                    tags TEXT,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                    estimated_duration INTEGER,
-                    ai_suggestions TEXT,
-                    context_keywords TEXT
-                )
-            ''')
-
-            # Table for analytics
-            cur.execute('''
-                CREATE TABLE IF NOT EXISTS task_analytics (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    date TEXT,
-                    completed_tasks INTEGER,
-                    productivity_score REAL,
-                    category_performance TEXT
-                )
-            ''')
-
-            c.commit()
-            return c
-
-        conn = init_database()
-
-    return conn
 
+def invalidate_reads():
+    global _generation
+    with _read_cache_lock:
+        _generation += 1
+        _read_cache.clear()
+
+
+def get_read_cache_stats():
+    with _read_cache_lock:
+        lookups = _read_cache_stats["hits"] + _read_cache_stats["misses"]
+        return {
+            **_read_cache_stats,
+            "hit_rate": round(_read_cache_stats["hits"] / lookups, 4) if lookups else None,
+            "entries": len(_read_cache),
+            "generation": _generation,
+        }
+
+
+def _cached(kind, sql, params, load):
+    if isinstance(params, dict):
+        params = tuple(sorted(params.items()))
+    key = (kind, sql, tuple(params or ()))
+    now = time.monotonic()
+    with _read_cache_lock:
+        entry = _read_cache.get(key)
+        if entry is not None and now - entry[0] < READ_CACHE_SECONDS:
+            _read_cache.move_to_end(key)
+            _read_cache_stats["hits"] += 1
+            return entry[1]
+        _read_cache_stats["misses"] += 1
+        generation = _generation
+
+    value = load()
+    with _read_cache_lock:
+        # Skip results a write may have overtaken while the query ran
+        if generation == _generation:
+            _read_cache[key] = (now, value)
+            while len(_read_cache) > READ_CACHE_SIZE:
+                _read_cache.popitem(last=False)
+    return value
+
+
+def _now_minute():
+    """The current time to the minute, so time-dependent reads stay cacheable within a minute."""
+    return datetime.now().strftime('%Y-%m-%d %H:%M:00')
+
+
+def _read_frame(sql, db, params=None):
+    # pandas is only imported by the pages that show task tables
+    import pandas as pd
+    frame = _cached("frame", sql, params, lambda: pd.read_sql_query(sql, db, params=params))
+    # Callers get their own copy to modify
+    return frame.copy()
+
+
+def _read_rows(sql, params=()):
+    """All rows of a query as a list of tuples, through the read cache."""
+    rows = _cached("rows", sql, params, lambda: get_connection().execute(sql, params).fetchall())
+    return list(rows)
+
+
+def _empty_frame():
+    import pandas as pd
+    return pd.DataFrame()
+
+
+def use_database(path):
+    """
+    Point this process at another database file, e.g. a scratch file for
+    benchmarks. Returns its writer connection.
+    """
+    global _manager
+    close_database()
+    _manager = ConnectionManager(path)
+    invalidate_reads()
+    return _manager.writer
+
+
+def close_database():
+    """Close every connection to the current database file."""
+    global _manager
+    if _manager is not None:
+        _manager.close()
+        _manager = None
+    # Otherwise the next get_manager() would get the closed manager back
+    init_database.clear()
+    invalidate_reads()
+
+
+# Schema changes applied on top of the base tables, in order. The number of
+# entries already applied is stored in PRAGMA user_version, so each step runs
+# exactly once per database file. Append new steps; never edit old ones.
+SCHEMA_MIGRATIONS = [
+    # 1: indexes for the task list views and filters
+    [
+        "CREATE INDEX IF NOT EXISTS idx_tasks_status_due ON tasks(status, due_date)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_status_created ON tasks(status, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_category ON tasks(category, due_date)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority, due_date)",
+        # "status != 'completed'" cannot use idx_tasks_status_due, so the open
+        # task views get a partial index that is already sorted by due date
+        "CREATE INDEX IF NOT EXISTS idx_tasks_open_due ON tasks(due_date) WHERE status != 'completed'",
+    ],
+    # 2: daily rollups kept in task_analytics and task_category_daily
+    [
+        "ALTER TABLE tasks ADD COLUMN completed_at TEXT",
+        # Best guess for tasks completed before completed_at existed
+        "UPDATE tasks SET completed_at = created_at WHERE status = 'completed'",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks(created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_tasks_completed_at ON tasks(completed_at) WHERE status = 'completed'",
+        '''
+            CREATE TABLE IF NOT EXISTS task_category_daily (
+                date TEXT NOT NULL,
+                category TEXT NOT NULL,
+                created_tasks INTEGER NOT NULL DEFAULT 0,
+                completed_tasks INTEGER NOT NULL DEFAULT 0,
+                completed_minutes INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (date, category)
+            ) WITHOUT ROWID
+        ''',
+        "DELETE FROM task_analytics WHERE id NOT IN (SELECT MAX(id) FROM task_analytics GROUP BY date)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_task_analytics_date ON task_analytics(date)",
+        lambda c: _rebuild_rollups(c),
+    ],
+    # 3: persistent email reminders
+    [
+        '''
+            CREATE TABLE IF NOT EXISTS reminders (
+                reminder_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                task_key TEXT NOT NULL,
+                recipient_email TEXT NOT NULL,
+                subject TEXT,
+                html_content TEXT,
+                send_at TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                sent_at TEXT,
+                last_error TEXT,
+                UNIQUE (task_key, recipient_email)
+            )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_reminders_pending ON reminders(send_at) WHERE status = 'pending'",
+    ],
+    # 4: category corrections made in the edit form, for the online learner
+    [
+        '''
+            CREATE TABLE IF NOT EXISTS category_feedback (
+                feedback_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                task_id INTEGER,
+                text TEXT NOT NULL,
+                predicted_category TEXT,
+                corrected_category TEXT NOT NULL,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        ''',
+    ],
+    # 5: term-frequency index over task names, for the word cloud and keyword analytics
+    [
+        '''
+            CREATE TABLE IF NOT EXISTS term_frequency (
+                term TEXT NOT NULL,
+                category TEXT NOT NULL,
+                day TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                open_count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (term, category, day)
+            ) WITHOUT ROWID
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_term_frequency_day ON term_frequency(category, day)",
+        '''
+            CREATE TABLE IF NOT EXISTS term_totals (
+                term TEXT NOT NULL,
+                category TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                open_count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (term, category)
+            ) WITHOUT ROWID
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_term_totals_count ON term_totals(category, count DESC, term)",
+        "CREATE INDEX IF NOT EXISTS idx_term_totals_open ON term_totals(category, open_count DESC, term)",
+        lambda c: _rebuild_term_index(c),
+    ],
+    # 6: full-text search over task_name, tags and context_keywords
+    [
+        lambda c: _create_search_index(c),
+    ],
+    # 7: when a reminder was claimed for delivery, so only expired claims are released
+    [
+        "ALTER TABLE reminders ADD COLUMN claimed_at TEXT",
+    ],
+]
+
+
+def create_schema(c):
+    """Create the base tables if needed, then apply pending migrations."""
+    cur = c.cursor()
+
+    # Table for tasks
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS tasks (
+            task_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_name TEXT,
+            category TEXT,
+            priority TEXT,
+            due_date TEXT,
+            status TEXT,
+            tags TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            estimated_duration INTEGER,
+            ai_suggestions TEXT,
+            context_keywords TEXT
+        )
+    ''')
+
+    # Table for analytics
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS task_analytics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT,
+            completed_tasks INTEGER,
+            productivity_score REAL,
+            category_performance TEXT
+        )
+    ''')
+    c.commit()
+
+    apply_migrations(c)
+
+
+def apply_migrations(c):
+    """
+    Apply the pending SCHEMA_MIGRATIONS, each in its own transaction
+    together with its user_version bump.
+    """
+    version = c.execute("PRAGMA user_version").fetchone()[0]
+    # sqlite3 only opens a transaction implicitly before INSERT/UPDATE/DELETE,
+    # so DDL would commit statement by statement and a failing step would
+    # leave half a migration behind with user_version unchanged. BEGIN and
+    # COMMIT are issued by hand instead.
+    isolation_level = c.isolation_level
+    c.isolation_level = None
+    try:
+        for number, statements in enumerate(SCHEMA_MIGRATIONS[version:], start=version + 1):
+            c.execute("BEGIN")
+            try:
+                for statement in statements:
+                    if callable(statement):
+                        statement(c)
+                    else:
+                        c.execute(statement)
+                # PRAGMA cannot take a bound parameter
+                c.execute(f"PRAGMA user_version = {number}")
+            except BaseException:
+                c.execute("ROLLBACK")
+                raise
+            c.execute("COMMIT")
+    finally:
+        c.isolation_level = isolation_level
+    if version < len(SCHEMA_MIGRATIONS):
+        c.execute("ANALYZE")
+    return len(SCHEMA_MIGRATIONS)
+
+
+def explain_query_plan(sql, params=(), db=None):
+    """Return the EXPLAIN QUERY PLAN detail lines for a query."""
+    db = db or get_connection()
+    return [row[-1] for row in db.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+
+INSERT_TASK_SQL = '''
+    INSERT INTO tasks (
+        task_name, category, priority, due_date, status, tags,
+        estimated_duration, ai_suggestions, context_keywords
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+
+def _task_row(task_data):
+    return (
+        task_data["task_name"],
+        task_data["category"],
+        task_data["priority"],
+        task_data["due_date"],
+        task_data["status"],
+        task_data["tags"],
+        int(task_data["estimated_duration"]),
+        str(task_data["ai_suggestions"]),
+        str(task_data["context_keywords"])
+    )
 
 
 def add_advanced_task(task_data):
     """
     Add a new task to the database using validated data from the agent.
+    Returns the new task_id, or False on failure.
     """
     try:
-        c = get_connection().cursor()
-        c.execute('''
-            INSERT INTO tasks (
-                task_name, category, priority, due_date, status, tags,
-                estimated_duration, ai_suggestions, context_keywords
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            task_data["task_name"],
-            task_data["category"],
-            task_data["priority"],
-            task_data["due_date"],
-            task_data["status"],
-            task_data["tags"],
-            int(task_data["estimated_duration"]),
-            str(task_data["ai_suggestions"]),
-            str(task_data["context_keywords"])
-        ))
-        get_connection().commit()
-        return True
+        with write_transaction() as db:
+            cur = db.execute(INSERT_TASK_SQL, _task_row(task_data))
+            refresh_rollups(db, _rollup_days(db, cur.lastrowid))
+            _index_task_terms(db, cur.lastrowid, 1)
+        return cur.lastrowid
 
     except Exception as e:
         import streamlit as st
@@ -94,27 +474,81 @@ def add_advanced_task(task_data):
         return False
 
 
+def add_advanced_tasks(tasks):
+    """
+    Insert many parsed tasks with one executemany in a single transaction.
+    Returns the number of rows written. Used outside Streamlit (task_cli.py),
+    so errors are raised rather than shown with st.error; nothing is written
+    if any row fails.
+    """
+    rows = [_task_row(task_data) for task_data in tasks]
+    if not rows:
+        return 0
+    with write_transaction() as db:
+        last_id = db.execute("SELECT COALESCE(MAX(task_id), 0) FROM tasks").fetchone()[0]
+        db.executemany(INSERT_TASK_SQL, rows)
+        # Every row was stamped with today's created_at
+        refresh_rollups(db, {db.execute("SELECT date('now')").fetchone()[0]})
+        _index_terms(db, "task_id > ?", (last_id,), 1)
+    return len(rows)
+
+
 def update_task(task_id, name, category, priority, due_date, tags, duration, suggestions, keywords):
     try:
-        c = get_connection().cursor()
-        c.execute('''UPDATE tasks SET
-            task_name = ?, category = ?, priority = ?, due_date = ?,
-            tags = ?, estimated_duration = ?, ai_suggestions = ?, context_keywords = ?
-            WHERE task_id = ?''', (
-            name, category, priority, due_date, tags,
-            duration, suggestions, keywords, task_id
-        ))
-        conn.commit()
+        with write_transaction() as db:
+            days = _rollup_days(db, task_id)
+            _record_category_change(db, task_id, name, category)
+            _index_task_terms(db, task_id, -1)
+            db.execute('''UPDATE tasks SET
+                task_name = ?, category = ?, priority = ?, due_date = ?,
+                tags = ?, estimated_duration = ?, ai_suggestions = ?, context_keywords = ?
+                WHERE task_id = ?''', (
+                name, category, priority, due_date, tags,
+                duration, suggestions, keywords, task_id
+            ))
+            refresh_rollups(db, days)
+            _index_task_terms(db, task_id, 1)
         return True
     except Exception as e:
         st.error(f"Error updating task: {e}")
         return False
 
+def _record_category_change(db, task_id, name, category):
+    row = db.execute("SELECT category FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+    if row is None or not category or not category.strip():
+        return
+    previous, corrected = row[0], category.strip().lower()
+    if corrected != (previous or "").strip().lower():
+        db.execute(
+            "INSERT INTO category_feedback (task_id, text, predicted_category, corrected_category) "
+            "VALUES (?, ?, ?, ?)", (task_id, name, previous, corrected)
+        )
+
+
+def get_category_feedback(after_id=0, limit=None):
+    """Category corrections with feedback_id > after_id, oldest first."""
+    sql = ("SELECT feedback_id, task_id, text, predicted_category, corrected_category, created_at "
+           "FROM category_feedback WHERE feedback_id > ? ORDER BY feedback_id ASC")
+    params = [after_id]
+    if limit:
+        sql += " LIMIT ?"
+        params.append(limit)
+    cursor = get_connection().execute(sql, params)
+    columns = [col[0] for col in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
 def delete_task(task_id):
     try:
-        c = get_connection().cursor()
-        c.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
-        conn.commit()
+        with write_transaction() as db:
+            days = _rollup_days(db, task_id)
+            _index_task_terms(db, task_id, -1)
+            db.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+            db.execute(
+                "UPDATE reminders SET status = 'dropped', last_error = 'task deleted' "
+                "WHERE task_key = ? AND status = 'pending'", (reminder_task_key({"task_id": task_id}),)
+            )
+            refresh_rollups(db, days)
         return True
     except Exception as e:
         st.error(f"Error deleting task: {e}")
@@ -122,79 +556,496 @@ def delete_task(task_id):
 
 def update_task_status(task_id, status):
     try:
-        c = get_connection().cursor()
-        c.execute("UPDATE tasks SET status = ? WHERE task_id = ?", (status, task_id))
-        conn.commit()
+        with write_transaction() as db:
+            days = _rollup_days(db, task_id)
+            _index_task_terms(db, task_id, -1)
+            db.execute('''UPDATE tasks SET
+                status = ?,
+                completed_at = CASE WHEN ? = 'completed'
+                    THEN COALESCE(completed_at, CURRENT_TIMESTAMP) ELSE NULL END
+                WHERE task_id = ?''', (status, status, task_id))
+            refresh_rollups(db, days | _rollup_days(db, task_id))
+            _index_task_terms(db, task_id, 1)
         return True
     except Exception as e:
         st.error(f"Error updating task status: {e}")
         return False
 
 
+# ---------------------------------------------------------------------------
+# Daily rollups
+#
+# task_category_daily holds, per UTC day and category, how many tasks were
+# created and completed and the estimated minutes completed. task_analytics
+# holds one row per day derived from it. Every write above recomputes only
+# the days the changed task touches, so maintaining the rollups costs the
+# same no matter how much history exists.
+# ---------------------------------------------------------------------------
+
+_ROLLUP_INSERT_SQL = """
+    INSERT INTO task_category_daily (date, category, created_tasks, completed_tasks, completed_minutes)
+    SELECT day, category, SUM(created), SUM(completed), SUM(minutes) FROM (
+        SELECT date(created_at) AS day, COALESCE(category, 'other') AS category,
+               1 AS created, 0 AS completed, 0 AS minutes
+        FROM tasks WHERE created_at >= :start AND created_at < :end
+        UNION ALL
+        SELECT date(completed_at), COALESCE(category, 'other'),
+               0, 1, COALESCE(estimated_duration, 0)
+        FROM tasks WHERE status = 'completed' AND completed_at >= :start AND completed_at < :end
+    )
+    GROUP BY day, category
+"""
+
+
+def _rollup_days(db, task_id):
+    """UTC days whose rollups depend on the given task."""
+    row = db.execute(
+        "SELECT date(created_at), date(completed_at) FROM tasks WHERE task_id = ?",
+        (task_id,)
+    ).fetchone()
+    return {day for day in (row or ()) if day}
+
+
+def _productivity_score(created, completed):
+    """Tasks completed as a percentage of tasks created that day, capped at 100."""
+    if not created:
+        return 100.0 if completed else 0.0
+    return round(min(100.0, 100.0 * completed / created), 1)
+
+
+def _rebuild_rollups(db, start="0000-00-00", end="9999-99-99"):
+    """Recompute every rollup row for UTC days in [start, end)."""
+    bounds = {"start": start, "end": end}
+    db.execute("DELETE FROM task_category_daily WHERE date >= :start AND date < :end", bounds)
+    db.execute(_ROLLUP_INSERT_SQL, bounds)
+    db.execute("DELETE FROM task_analytics WHERE date >= :start AND date < :end", bounds)
+
+    days = {}
+    for day, category, created, completed, _ in db.execute(
+        "SELECT * FROM task_category_daily WHERE date >= :start AND date < :end", bounds
+    ):
+        totals = days.setdefault(day, {"created": 0, "completed": 0, "categories": {}})
+        totals["created"] += created
+        totals["completed"] += completed
+        if completed:
+            totals["categories"][category] = completed
+
+    db.executemany(
+        "INSERT INTO task_analytics (date, completed_tasks, productivity_score, category_performance) VALUES (?, ?, ?, ?)",
+        [
+            (day, totals["completed"],
+             _productivity_score(totals["created"], totals["completed"]),
+             json.dumps(totals["categories"]))
+            for day, totals in days.items()
+        ]
+    )
+
+
+def refresh_rollups(db, days):
+    """Recompute the rollups for a set of 'YYYY-MM-DD' days inside the caller's transaction."""
+    for day in sorted(days):
+        next_day = (datetime.strptime(day, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+        _rebuild_rollups(db, day, next_day)
+
+
+def backfill_rollups():
+    """Rebuild all rollups from the tasks table. Returns the number of days written."""
+    with write_transaction() as db:
+        _rebuild_rollups(db)
+        return db.execute("SELECT COUNT(*) FROM task_analytics").fetchone()[0]
+
+
+def get_daily_rollups(days=30):
+    """
+    Per-day created/completed counts and productivity score for the last
+    `days` UTC days, read from the rollup tables.
+    """
+    try:
+        since = (datetime.utcnow() - timedelta(days=days - 1)).strftime('%Y-%m-%d')
+        return _read_frame('''
+            SELECT d.date,
+                   SUM(d.created_tasks) AS created_tasks,
+                   SUM(d.completed_tasks) AS completed_tasks,
+                   SUM(d.completed_minutes) AS completed_minutes,
+                   a.productivity_score
+            FROM task_category_daily d
+            LEFT JOIN task_analytics a ON a.date = d.date
+            WHERE d.date >= ?
+            GROUP BY d.date
+            ORDER BY d.date ASC
+        ''', get_connection(), params=(since,))
+    except Exception as e:
+        print(f"[get_daily_rollups] Error: {e}")
+        return _empty_frame()
+
+
+def get_category_rollups(days=30):
+    """Per-category totals over the last `days` UTC days, read from task_category_daily."""
+    try:
+        since = (datetime.utcnow() - timedelta(days=days - 1)).strftime('%Y-%m-%d')
+        return _read_frame('''
+            SELECT category,
+                   SUM(created_tasks) AS created_tasks,
+                   SUM(completed_tasks) AS completed_tasks,
+                   SUM(completed_minutes) AS completed_minutes
+            FROM task_category_daily
+            WHERE date >= ?
+            GROUP BY category
+            ORDER BY completed_tasks DESC
+        ''', get_connection(), params=(since,))
+    except Exception as e:
+        print(f"[get_category_rollups] Error: {e}")
+        return _empty_frame()
+
+
+# ---------------------------------------------------------------------------
+# Term-frequency index
+#
+# term_frequency counts the words of task names (see term_index.task_terms)
+# per term, category and UTC creation day; term_totals holds the same
+# counts summed over days. open_count only counts tasks that are not
+# completed. Rows with category ALL_CATEGORIES sum every category, so
+# top-k queries are a walk down an index however many tasks exist. Every
+# task write subtracts the task's terms before changing it and adds them
+# back afterwards, in the same transaction.
+# ---------------------------------------------------------------------------
+
+ALL_CATEGORIES = "*"
+
+_TERM_DAY_UPSERT_SQL = """
+    INSERT INTO term_frequency (term, category, day, count, open_count) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (term, category, day) DO UPDATE SET
+        count = count + excluded.count, open_count = open_count + excluded.open_count
+"""
+_TERM_TOTAL_UPSERT_SQL = """
+    INSERT INTO term_totals (term, category, count, open_count) VALUES (?, ?, ?, ?)
+    ON CONFLICT (term, category) DO UPDATE SET
+        count = count + excluded.count, open_count = open_count + excluded.open_count
+"""
+
+# Top-k terms; {column} is count or open_count. Served by idx_term_totals_*.
+TOP_TERMS_SQL = """
+    SELECT term, {column} FROM term_totals
+    WHERE category = ? AND {column} > 0
+    ORDER BY {column} DESC, term ASC LIMIT ?
+"""
+TRENDING_TERMS_SQL = """
+    SELECT term,
+           SUM(CASE WHEN day >= :recent THEN count ELSE 0 END) AS recent,
+           SUM(CASE WHEN day < :recent THEN count ELSE 0 END) AS previous
+    FROM term_frequency
+    WHERE category = :category AND day >= :since
+    GROUP BY term
+    HAVING recent > 0
+    ORDER BY recent - previous DESC, recent DESC, term ASC
+    LIMIT :k
+"""
+
+
+def _index_terms(db, where, params, sign):
+    """Add (sign=1) or subtract (sign=-1) the terms of the tasks matching `where`."""
+    deltas = {}
+    for name, category, day, status in db.execute(
+        "SELECT task_name, COALESCE(category, 'other'), COALESCE(date(created_at), date('now')), status "
+        f"FROM tasks WHERE {where}", params
+    ):
+        is_open = status != 'completed'
+        for term, n in task_terms(name).items():
+            for key in ((term, category, day), (term, ALL_CATEGORIES, day)):
+                delta = deltas.setdefault(key, [0, 0])
+                delta[0] += sign * n
+                delta[1] += sign * n * is_open
+    if not deltas:
+        return
+
+    totals = {}
+    for (term, category, _), (count, open_count) in deltas.items():
+        total = totals.setdefault((term, category), [0, 0])
+        total[0] += count
+        total[1] += open_count
+    db.executemany(_TERM_DAY_UPSERT_SQL, [(*key, *delta) for key, delta in deltas.items()])
+    db.executemany(_TERM_TOTAL_UPSERT_SQL, [(*key, *total) for key, total in totals.items()])
+    if sign < 0:
+        db.executemany("DELETE FROM term_frequency WHERE term = ? AND category = ? AND day = ? AND count <= 0",
+                       list(deltas))
+        db.executemany("DELETE FROM term_totals WHERE term = ? AND category = ? AND count <= 0", list(totals))
+
+
+def _index_task_terms(db, task_id, sign):
+    _index_terms(db, "task_id = ?", (task_id,), sign)
+
+
+def _rebuild_term_index(db):
+    db.execute("DELETE FROM term_frequency")
+    db.execute("DELETE FROM term_totals")
+    _index_terms(db, "1", (), 1)
+
+
+def backfill_term_index():
+    """Rebuild the term-frequency index from the tasks table. Returns the number of distinct terms."""
+    with write_transaction() as db:
+        _rebuild_term_index(db)
+        return db.execute("SELECT COUNT(*) FROM term_totals WHERE category = ?", (ALL_CATEGORIES,)).fetchone()[0]
+
+
+def get_top_terms(k=50, category=None, open_only=False):
+    """The k most frequent terms as (term, count), over all tasks or only open ones."""
+    column = "open_count" if open_only else "count"
+    return _read_rows(TOP_TERMS_SQL.format(column=column), (category or ALL_CATEGORIES, k))
+
+
+def get_top_terms_by_category(k=5, open_only=False):
+    """{category: [(term, count), ...]} with the k most frequent terms of each category."""
+    categories = [row[0] for row in _read_rows(
+        "SELECT DISTINCT category FROM term_totals WHERE category != ? ORDER BY category", (ALL_CATEGORIES,)
+    )]
+    return {category: get_top_terms(k, category, open_only) for category in categories}
+
+
+def get_trending_terms(days=7, k=10, category=None):
+    """
+    Terms whose use grew most in the last `days` UTC days compared with the
+    `days` before, as (term, recent count, previous count).
+    """
+    today = datetime.utcnow().date()
+    return _read_rows(TRENDING_TERMS_SQL, {
+        "recent": (today - timedelta(days=days - 1)).strftime('%Y-%m-%d'),
+        "since": (today - timedelta(days=2 * days - 1)).strftime('%Y-%m-%d'),
+        "category": category or ALL_CATEGORIES,
+        "k": k,
+    })
+
+
+# ---------------------------------------------------------------------------
+# Keyset pagination
+#
+# Pages are fetched "after" the (sort value, task_id) of the previous page's
+# last row rather than with OFFSET, so every page is an index range scan no
+# matter how deep the user pages.
+# ---------------------------------------------------------------------------
+
+DEFAULT_PAGE_SIZE = 25
+
+# Pseudo-status matching every task that is not completed
+OPEN_STATUS = "open"
+
+# view name -> (sort column, descending)
+TASK_VIEWS = {
+    "open": ("due_date", False),
+    "overdue": ("due_date", False),
+    "completed": ("created_at", True),
+}
+
+
+def _view_filters(view):
+    if view == "completed":
+        return {"status": "completed"}
+    if view == "overdue":
+        return {"status": OPEN_STATUS, "due_to": _now_minute()}
+    return {"status": OPEN_STATUS}
+
+
+def _task_filter_sql(priority=None, category=None, due_from=None, due_to=None, status=OPEN_STATUS):
+    """
+    Build a parameterised WHERE clause. due_from is inclusive and due_to is
+    exclusive; both are 'YYYY-MM-DD HH:MM:SS' strings so they compare
+    directly against the stored due_date and can use its indexes.
+    """
+    clauses, params = [], {}
+    if status == OPEN_STATUS:
+        clauses.append("status != 'completed'")
+    elif status:
+        clauses.append("status = :status")
+        params["status"] = status
+    if priority:
+        clauses.append("priority = :priority")
+        params["priority"] = priority
+    if category:
+        clauses.append("category = :category")
+        params["category"] = category
+    if due_from:
+        clauses.append("due_date >= :due_from")
+        params["due_from"] = due_from
+    if due_to:
+        clauses.append("due_date < :due_to")
+        params["due_to"] = due_to
+    return " AND ".join(clauses) or "1", params
+
+
+def query_tasks(priority=None, category=None, due_from=None, due_to=None, status=OPEN_STATUS,
+                after=None, limit=None, order_by="due_date", descending=False):
+    """
+    Return the tasks matching every given filter, ordered by `order_by` then
+    task_id. Pass `after` (see page_cursor) and `limit` to fetch one keyset
+    page instead of every match.
+    """
+    try:
+        where, params = _task_filter_sql(priority, category, due_from, due_to, status)
+        direction = "DESC" if descending else "ASC"
+        if after is not None:
+            where += f" AND ({order_by}, task_id) {'<' if descending else '>'} (:after_key, :after_id)"
+            params["after_key"], params["after_id"] = after
+        sql = f"SELECT * FROM tasks WHERE {where} ORDER BY {order_by} {direction}, task_id {direction}"
+        if limit is not None:
+            sql += " LIMIT :limit"
+            params["limit"] = int(limit)
+        return _read_frame(sql, get_connection(), params=params)
+    except Exception as e:
+        print(f"[query_tasks] Error: {e}")
+        return _empty_frame()
+
+
+def count_matching_tasks(priority=None, category=None, due_from=None, due_to=None, status=OPEN_STATUS):
+    try:
+        where, params = _task_filter_sql(priority, category, due_from, due_to, status)
+        return _read_rows(f"SELECT COUNT(*) FROM tasks WHERE {where}", params)[0][0]
+    except Exception as e:
+        print(f"[count_matching_tasks] Error: {e}")
+        return 0
+
+
+def get_task_page(view, after=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    Return up to `limit` tasks of a view ("open", "overdue" or "completed")
+    that sort after the `after` cursor, as returned by page_cursor().
+    """
+    order_by, descending = TASK_VIEWS[view]
+    return query_tasks(after=after, limit=limit, order_by=order_by, descending=descending,
+                       **_view_filters(view))
+
+
+def count_tasks(view):
+    return count_matching_tasks(**_view_filters(view))
+
+
+def page_cursor(df, order_by="due_date"):
+    """Cursor pointing just past the last row of a page, for query_tasks(after=...)."""
+    if df.empty:
+        return None
+    last = df.iloc[-1]
+    return (last[order_by], int(last["task_id"]))
+
+
+# Queries behind the task list views. Each one is served by an index from
+# SCHEMA_MIGRATIONS (see benchmarks/check_query_plans.py).
+OPEN_TASKS_SQL = "SELECT * FROM tasks WHERE status != 'completed' ORDER BY due_date ASC"
+COMPLETED_TASKS_SQL = "SELECT * FROM tasks WHERE status = 'completed' ORDER BY created_at DESC"
+OVERDUE_TASKS_SQL = "SELECT * FROM tasks WHERE due_date < ? AND status != 'completed' ORDER BY due_date ASC"
+PENDING_TASKS_SQL = "SELECT * FROM tasks WHERE status = 'pending' AND due_date >= ? ORDER BY due_date ASC"
+
+
 def get_all_tasks():
     try:
         conn = get_connection()
-        return pd.read_sql_query(
-            "SELECT * FROM tasks WHERE status != 'completed' ORDER BY due_date ASC", conn
-        )
+        return _read_frame(OPEN_TASKS_SQL, conn)
     except Exception as e:
         print(f"[get_all_tasks] Error: {e}")
-        return pd.DataFrame()
+        return _empty_frame()
 
 
 def get_completed_tasks():
     try:
         conn = get_connection()
-        return pd.read_sql_query("SELECT * FROM tasks WHERE status = 'completed' ORDER BY created_at DESC", conn)
+        return _read_frame(COMPLETED_TASKS_SQL, conn)
     except Exception as e:
         print(f"[get_completed_tasks] Error: {e}")
-        return pd.DataFrame()
+        return _empty_frame()
 
 def get_overdue_tasks():
     try:
         conn = get_connection()
-        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        return pd.read_sql_query("SELECT * FROM tasks WHERE due_date < ? AND status != 'completed'", conn, params=(now,))
+        return _read_frame(OVERDUE_TASKS_SQL, conn, params=(_now_minute(),))
     except Exception as e:
         print(f"[get_overdue_tasks] Error: {e}")
-        return pd.DataFrame()
+        return _empty_frame()
 
 
 def get_pending_tasks():
     try:
-        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        return pd.read_sql_query("SELECT * FROM tasks WHERE status = 'pending' AND due_date >= ?", conn, params=(now,))
+        return _read_frame(PENDING_TASKS_SQL, get_connection(), params=(_now_minute(),))
     except:
-        return pd.DataFrame()
+        return _empty_frame()
 
-def get_smart_recommendations():
+# One pass over tasks, grouped by (category, priority). Every dashboard metric
+# and recommendation input is a sum over these groups, so the analytics page
+# needs a single round trip regardless of how many tasks exist.
+TASK_METRICS_SQL = """
+    SELECT
+        category,
+        priority,
+        COUNT(*) AS total,
+        SUM(status = 'completed') AS completed,
+        SUM(status = 'pending') AS pending,
+        SUM(status != 'completed') AS open,
+        SUM(status != 'completed' AND due_date < ?) AS overdue,
+        COALESCE(SUM(estimated_duration), 0) AS total_minutes,
+        COALESCE(SUM(CASE WHEN status != 'completed' THEN estimated_duration END), 0) AS open_minutes,
+        SUM(status != 'completed' AND estimated_duration IS NOT NULL) AS open_timed
+    FROM tasks
+    GROUP BY category, priority
+"""
+
+
+def get_task_metrics():
+    """
+    Return dashboard totals plus open-task breakdowns by category and priority,
+    computed by one aggregate query.
+    """
+    metrics = {
+        "total_tasks": 0,
+        "completed_tasks": 0,
+        "pending_tasks": 0,
+        "open_tasks": 0,
+        "overdue_tasks": 0,
+        "high_priority_open": 0,
+        "total_estimated_time": 0,
+        "open_estimated_time": 0,
+        "average_open_duration": 0.0,
+        "open_by_category": {},
+        "open_by_priority": {},
+    }
+    open_timed = 0
+    for (category, priority, total, completed, pending, open_count, overdue,
+         total_minutes, open_minutes, timed) in _read_rows(TASK_METRICS_SQL, (_now_minute(),)):
+        metrics["total_tasks"] += total
+        metrics["completed_tasks"] += completed or 0
+        metrics["pending_tasks"] += pending or 0
+        metrics["open_tasks"] += open_count or 0
+        metrics["overdue_tasks"] += overdue or 0
+        metrics["total_estimated_time"] += total_minutes
+        metrics["open_estimated_time"] += open_minutes
+        open_timed += timed or 0
+        if open_count:
+            by_category = metrics["open_by_category"]
+            by_category[category] = by_category.get(category, 0) + open_count
+            by_priority = metrics["open_by_priority"]
+            by_priority[priority] = by_priority.get(priority, 0) + open_count
+            if priority == "high":
+                metrics["high_priority_open"] += open_count
+
+    if open_timed:
+        metrics["average_open_duration"] = metrics["open_estimated_time"] / open_timed
+    return metrics
+
+
+def get_smart_recommendations(metrics=None):
     try:
-        conn = get_connection()
-        df = pd.read_sql_query("SELECT * FROM tasks", conn)
+        if metrics is None:
+            metrics = get_task_metrics()
 
-        if df.empty:
+        if not metrics["total_tasks"]:
             return []
 
         recos = []
 
-        overdue = df[
-            (df['status'] != 'completed') &
-            (pd.to_datetime(df['due_date']) < datetime.now())
-        ]
-        high_priority = df[
-            (df['status'] != 'completed') &
-            (df['priority'] == 'high')
-        ]
-        total_est_time = df[df['status'] != 'completed']['estimated_duration'].sum()
+        if metrics["overdue_tasks"] > 0:
+            recos.append(f"⏰ You have {metrics['overdue_tasks']} overdue tasks. Prioritize completing them first.")
 
-        if len(overdue) > 0:
-            recos.append(f"⏰ You have {len(overdue)} overdue tasks. Prioritize completing them first.")
-
-        if total_est_time > 300:
+        if metrics["open_estimated_time"] > 300:
             recos.append("⏱️ Your pending tasks require significant time. Consider prioritizing the most important ones.")
 
-        if len(high_priority) > 0:
-            recos.append(f"🔥 You have {len(high_priority)} high priority tasks pending.")
+        if metrics["high_priority_open"] > 0:
+            recos.append(f"🔥 You have {metrics['high_priority_open']} high priority tasks pending.")
 
         return recos
 
@@ -203,30 +1054,281 @@ def get_smart_recommendations():
         return []
 
 
-def get_tasks_analytics():
+def get_tasks_analytics(metrics=None):
     try:
-        query = """
-            SELECT 
-                task_id,
-                task_name,
-                status,
-                due_date,
-                estimated_duration
-            FROM tasks
-        """
-        df = pd.read_sql_query(query, get_connection())
+        if metrics is None:
+            metrics = get_task_metrics()
 
-        if df.empty:
+        if not metrics["total_tasks"]:
             return {}
 
         return {
-            "total_estimated_time": df['estimated_duration'].sum(),
-            "completed_tasks": len(df[df['status'] == 'completed']),
-            "pending_tasks": len(df[df['status'] == 'pending']),
-            "overdue_tasks": len(get_overdue_tasks()),
-            "total_tasks": len(df)
+            "total_estimated_time": metrics["total_estimated_time"],
+            "completed_tasks": metrics["completed_tasks"],
+            "pending_tasks": metrics["pending_tasks"],
+            "overdue_tasks": metrics["overdue_tasks"],
+            "total_tasks": metrics["total_tasks"]
         }
     except Exception as e:
         st.error(f"Analytics error: {e}")
         return {}
 
+
+def get_open_task_names():
+    """Names of all non-completed tasks, for the word cloud."""
+    try:
+        rows = _read_rows("SELECT task_name FROM tasks WHERE status != 'completed' ORDER BY due_date ASC")
+        return [row[0] for row in rows]
+    except Exception as e:
+        print(f"[get_open_task_names] Error: {e}")
+        return []
+
+
+# ---------------------------------------------------------------------------
+# Email reminders
+#
+# Reminders live in the reminders table so they survive restarts. There is at
+# most one row per (task, recipient): scheduling the same reminder again
+# updates it instead of adding a duplicate.
+# ---------------------------------------------------------------------------
+
+def reminder_task_key(task):
+    """Stable identity for a task, used to make reminder scheduling idempotent."""
+    if task.get("task_id") is not None:
+        return f"task:{int(task['task_id'])}"
+    return f"name:{task['task_name']}|{task['due_date']}"
+
+
+def _reminder_rows(cursor):
+    columns = [col[0] for col in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def save_reminder(task_key, recipient_email, subject, html_content, send_at):
+    """
+    Insert or reschedule the reminder for (task_key, recipient). Returns its
+    reminder_id. Saving an already-sent reminder with the same send time
+    leaves it sent.
+    """
+    with write_transaction(invalidate=False) as db:
+        db.execute('''
+            INSERT INTO reminders (task_key, recipient_email, subject, html_content, send_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (task_key, recipient_email) DO UPDATE SET
+                subject = excluded.subject,
+                html_content = excluded.html_content,
+                -- Re-submitting an unchanged reminder must not send it twice
+                status = CASE
+                    WHEN reminders.status IN ('sending', 'sent') AND reminders.send_at = excluded.send_at
+                    THEN reminders.status ELSE 'pending' END,
+                sent_at = CASE WHEN reminders.send_at = excluded.send_at THEN reminders.sent_at END,
+                send_at = excluded.send_at,
+                last_error = NULL
+        ''', (task_key, recipient_email, subject, html_content, send_at))
+        return db.execute(
+            "SELECT reminder_id FROM reminders WHERE task_key = ? AND recipient_email = ?",
+            (task_key, recipient_email)
+        ).fetchone()[0]
+
+
+def get_reminder(reminder_id):
+    rows = _reminder_rows(get_connection().execute(
+        "SELECT * FROM reminders WHERE reminder_id = ?", (reminder_id,)
+    ))
+    return rows[0] if rows else None
+
+
+def get_pending_reminders(due_before=None):
+    """Pending reminders ordered by send time, optionally only those due before a timestamp."""
+    sql = "SELECT * FROM reminders WHERE status = 'pending'"
+    params = ()
+    if due_before:
+        sql += " AND send_at < ?"
+        params = (due_before,)
+    return _reminder_rows(get_connection().execute(sql + " ORDER BY send_at ASC", params))
+
+
+def claim_reminders(due_by=None, reminder_ids=None):
+    """
+    Atomically move pending reminders to 'sending' and return them, so a
+    reminder is only ever handed to one delivery attempt. Selects either the
+    given ids or everything due at or before a timestamp.
+    """
+    sql = "SELECT * FROM reminders WHERE status = 'pending'"
+    params = []
+    if reminder_ids is not None:
+        if not reminder_ids:
+            return []
+        sql += f" AND reminder_id IN ({', '.join('?' * len(reminder_ids))})"
+        params.extend(reminder_ids)
+    if due_by:
+        sql += " AND send_at <= ?"
+        params.append(due_by)
+
+    with write_transaction(invalidate=False) as db:
+        db.execute("BEGIN IMMEDIATE")
+        rows = _reminder_rows(db.execute(sql + " ORDER BY send_at ASC", params))
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        db.executemany(
+            "UPDATE reminders SET status = 'sending', claimed_at = ? WHERE reminder_id = ?",
+            [(now, row["reminder_id"]) for row in rows]
+        )
+    return rows
+
+
+def release_stuck_reminders(claimed_before):
+    """
+    Return reminders left in 'sending' by a crashed process to 'pending'.
+    Only claims made before the given timestamp are released: newer ones may
+    belong to another process that is still delivering them.
+    """
+    with write_transaction(invalidate=False) as db:
+        return db.execute(
+            "UPDATE reminders SET status = 'pending', claimed_at = NULL "
+            "WHERE status = 'sending' AND (claimed_at IS NULL OR claimed_at < ?)",
+            (claimed_before,)
+        ).rowcount
+
+
+def mark_reminders(reminder_ids, status, error=None):
+    """Record the outcome of several reminders at once."""
+    sent_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S') if status == "sent" else None
+    with write_transaction(invalidate=False) as db:
+        db.executemany(
+            "UPDATE reminders SET status = ?, last_error = ?, sent_at = ? WHERE reminder_id = ?",
+            [(status, error, sent_at, reminder_id) for reminder_id in reminder_ids]
+        )
+
+
+def mark_reminder(reminder_id, status, error=None):
+    """Record the outcome of a reminder: 'sent', 'failed' or 'dropped'."""
+    with write_transaction(invalidate=False) as db:
+        db.execute(
+            "UPDATE reminders SET status = ?, last_error = ?, sent_at = ? WHERE reminder_id = ?",
+            (status, error,
+             datetime.now().strftime('%Y-%m-%d %H:%M:%S') if status == "sent" else None,
+             reminder_id)
+        )
+
+
+# ---------------------------------------------------------------------------
+# Full-text search
+#
+# tasks_fts is an FTS5 index over task_name, tags and context_keywords that
+# stores no text of its own (content='tasks'); triggers on tasks keep it in
+# sync. Results are ranked by bm25 with the task name weighted highest, and
+# every search word also matches as a prefix ("rep" finds "report"). On an
+# SQLite built without FTS5 the migration skips the index and search falls
+# back to a LIKE scan.
+# ---------------------------------------------------------------------------
+
+SEARCH_FIELDS = ("task_name", "tags", "context_keywords")
+# bm25 weights, in SEARCH_FIELDS order
+SEARCH_WEIGHTS = (10.0, 5.0, 1.0)
+
+_SEARCH_INDEX_SQL = [
+    '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+            task_name, tags, context_keywords,
+            content='tasks', content_rowid='task_id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+    ''',
+    '''
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+            INSERT INTO tasks_fts (rowid, task_name, tags, context_keywords)
+            VALUES (new.task_id, new.task_name, new.tags, new.context_keywords);
+        END
+    ''',
+    '''
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, task_name, tags, context_keywords)
+            VALUES ('delete', old.task_id, old.task_name, old.tags, old.context_keywords);
+        END
+    ''',
+    '''
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF task_name, tags, context_keywords ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, task_name, tags, context_keywords)
+            VALUES ('delete', old.task_id, old.task_name, old.tags, old.context_keywords);
+            INSERT INTO tasks_fts (rowid, task_name, tags, context_keywords)
+            VALUES (new.task_id, new.task_name, new.tags, new.context_keywords);
+        END
+    ''',
+    "INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')",
+]
+
+_SEARCH_WORDS = re.compile(r"\w+")
+
+
+def _create_search_index(db):
+    try:
+        db.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+        db.execute("DROP TABLE temp.fts5_probe")
+    except sqlite3.OperationalError as e:
+        print(f"[database] SQLite has no FTS5 ({e}); search will scan with LIKE")
+        return
+    for statement in _SEARCH_INDEX_SQL:
+        db.execute(statement)
+
+
+def search_index_available(db=None):
+    db = db or get_connection()
+    return db.execute("SELECT 1 FROM sqlite_master WHERE name = 'tasks_fts'").fetchone() is not None
+
+
+def fts_query(text):
+    """
+    Turn free text into an FTS5 query: every word must match, as a prefix.
+    Words are quoted, so FTS5 operators typed by the user are matched
+    literally. Returns None when the text has no words.
+    """
+    words = _SEARCH_WORDS.findall(text or "")
+    if not words:
+        return None
+    return " ".join('"' + word.replace('"', '""') + '"*' for word in words)
+
+
+def _search_sql(text, filters, select):
+    """(SQL, ORDER BY clause, params) selecting `select` for the tasks matching text and the task filters."""
+    where, params = _task_filter_sql(**filters)
+    if search_index_available():
+        params["match"] = fts_query(text)
+        weights = ", ".join(str(w) for w in SEARCH_WEIGHTS)
+        # CROSS JOIN keeps the index lookup as the outer loop; otherwise the
+        # planner may walk every open task and probe the index per row
+        return (f"SELECT {select} FROM tasks_fts CROSS JOIN tasks ON tasks.task_id = tasks_fts.rowid "
+                f"WHERE tasks_fts MATCH :match AND {where}",
+                f"bm25(tasks_fts, {weights}), tasks.task_id", params)
+    clauses = []
+    for i, word in enumerate(_SEARCH_WORDS.findall(text)):
+        params[f"word{i}"] = f"%{word}%"
+        clauses.append("(" + " OR ".join(f"{field} LIKE :word{i}" for field in SEARCH_FIELDS) + ")")
+    return (f"SELECT {select} FROM tasks WHERE {' AND '.join(clauses)} AND {where}",
+            "due_date ASC, task_id ASC", params)
+
+
+def search_tasks(text, limit=DEFAULT_PAGE_SIZE, offset=0, **filters):
+    """
+    Tasks matching the search text and the query_tasks filters (open tasks
+    by default), best match first. Page with limit/offset.
+    """
+    if fts_query(text) is None:
+        return _empty_frame()
+    try:
+        sql, order, params = _search_sql(text, filters, "tasks.*")
+        params.update(limit=int(limit), offset=int(offset))
+        return _read_frame(f"{sql} ORDER BY {order} LIMIT :limit OFFSET :offset", get_connection(), params=params)
+    except Exception as e:
+        print(f"[search_tasks] Error: {e}")
+        return _empty_frame()
+
+
+def count_search_results(text, **filters):
+    if fts_query(text) is None:
+        return 0
+    try:
+        sql, _, params = _search_sql(text, filters, "COUNT(*)")
+        return _read_rows(sql, params)[0][0]
+    except Exception as e:
+        print(f"[count_search_results] Error: {e}")
+        return 0
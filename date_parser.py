@@ -0,0 +1,178 @@
+# date_parser.py
+import calendar
+import re
+from datetime import date, datetime, time, timedelta
+
+# Single-pass date/time extraction for task text. Every supported expression
+# is one alternative of a precompiled pattern, so a task is scanned once and
+# the date and time of day come back together.
+
+WEEKDAYS = {
+    "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
+    "friday": 4, "saturday": 5, "sunday": 6
+}
+NUMBER_WORDS = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10
+}
+RELATIVE_DAYS = {
+    "today": 0, "tonight": 0, "tomorrow": 1, "day after tomorrow": 2, "next week": 7
+}
+
+# Each alternative starts with a literal or a digit class and marks its kind
+# with an empty named group at the end; with no capture group or boundary
+# in front, the regex engine rejects most positions on the first character.
+# Text is lowercased before scanning, so no IGNORECASE is needed.
+_TOKENS = re.compile(r"""
+    \b(?:
+        \d{4}-\d{1,2}-\d{1,2}
+            (?:[t\s]\d{1,2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:z|[+-]\d{2}:?\d{2})?)?(?!\d)(?P<iso>)
+      | \d{4}/\d{1,2}/\d{1,2}(?!\d)(?P<ymd>)
+      | \d{1,2}[/-]\d{1,2}[/-](?:\d{4}|\d{2})(?!\d)(?P<dmy>)
+      | \d{1,2}(?::\d{2})?\s*[ap]m\b(?P<clock12>)
+      | \d{1,2}:\d{2}(?!\d)(?P<clock24>)
+      | noon\b(?P<noon>)
+      | midnight\b(?P<midnight>)
+      | in\s+(?:\d+|an?|one|two|three|four|five|six|seven|eight|nine|ten)\s+
+            (?:min(?:ute)?s?|h(?:ou)?rs?|days?|weeks?|months?)\b(?P<offset>)
+      | end\s+of\s+(?:the\s+)?(?:day|week|month)\b(?P<end_of>)
+      | (?:day\s+after\s+tomorrow|today|tonight|tomorrow|next\s+week|next\s+month)\b(?P<relative>)
+      | (?:next|this|coming)\s+(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b(?P<weekday_mod>)
+      | (?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b(?P<weekday>)
+    )
+""", re.VERBOSE)
+
+# Every _TOKENS match contains a digit or one of these words, or is an
+# "in <n> <unit>" offset; substring checks rule out most task text before
+# the full pattern runs.
+_TRIGGERS = tuple("0123456789") + ("day", "noon", "midnight", "tonight", "tomorrow", "week", "month")
+
+# Splitters used only on the (rare) matched tokens
+_NUMBERS = re.compile(r"\d+")
+_WORDS = re.compile(r"[a-z]+|\d+")
+
+_ONE_DAY = timedelta(days=1)
+_MIDNIGHT = time(0, 0)
+
+# When several date expressions appear, the most specific one wins
+_DATE_RANK = {"absolute": 0, "relative": 1, "offset": 2, "end_of": 3, "weekday": 4}
+
+
+def _add_months(day, months):
+    month_index = day.month - 1 + months
+    year, month = day.year + month_index // 12, month_index % 12 + 1
+    return day.replace(year=year, month=month, day=min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def _full_year(value):
+    year = int(value)
+    return 2000 + year if year < 100 else year
+
+
+def _absolute_date(kind, numbers):
+    try:
+        if kind == "dmy":
+            day, month, year = numbers[:3]
+            return date(_full_year(year), int(month), int(day))
+        year, month, day = numbers[:3]
+        return date(int(year), int(month), int(day))
+    except ValueError:
+        return None
+
+
+def _clock(hour, minute):
+    return time(hour, minute) if hour < 24 and minute < 60 else None
+
+
+def _may_mention_date(lowered):
+    for trigger in _TRIGGERS:
+        if trigger in lowered:
+            return True
+    return "in " in lowered and ("min" in lowered or "hr" in lowered or "hour" in lowered)
+
+
+def parse_datetime(text, now=None):
+    """
+    Extract the due date and time of day from free text in one pass.
+
+    Returns (due, has_time): `due` is a datetime and `has_time` says whether
+    the text named a time of day. Without any date expression the due date is
+    tomorrow; without a time the time part is midnight.
+    """
+    now = now or datetime.now()
+    today = now.date()
+    lowered = text.lower()
+    if not _may_mention_date(lowered):
+        return datetime.combine(today + _ONE_DAY, _MIDNIGHT), False
+
+    best_date, best_rank = None, None
+    moment, clock = None, None
+
+    def offer(candidate, kind):
+        nonlocal best_date, best_rank
+        if candidate is not None and (best_rank is None or _DATE_RANK[kind] < best_rank):
+            best_date, best_rank = candidate, _DATE_RANK[kind]
+
+    for match in _TOKENS.finditer(lowered):
+        kind = match.lastgroup
+        token = match.group()
+        if kind in ("iso", "ymd", "dmy"):
+            numbers = _NUMBERS.findall(token)
+            offer(_absolute_date(kind, numbers), "absolute")
+            if kind == "iso" and len(numbers) >= 5 and clock is None:
+                clock = _clock(int(numbers[3]), int(numbers[4]))
+        elif kind == "clock12":
+            if clock is None:
+                numbers = _NUMBERS.findall(token)
+                hour = int(numbers[0]) % 12 + (12 if token.endswith("pm") else 0)
+                clock = _clock(hour, int(numbers[1]) if len(numbers) > 1 else 0)
+        elif kind == "clock24":
+            if clock is None:
+                hour, minute = _NUMBERS.findall(token)
+                clock = _clock(int(hour), int(minute))
+        elif kind in ("noon", "midnight"):
+            if clock is None:
+                clock = time(12, 0) if kind == "noon" else _MIDNIGHT
+        elif kind == "offset":
+            _, raw, unit = _WORDS.findall(token)
+            n = int(raw) if raw.isdigit() else NUMBER_WORDS[raw]
+            if unit.startswith("min") or unit.startswith("h"):
+                # Sub-day offsets fix both the date and the time
+                if moment is None:
+                    moment = now + (timedelta(minutes=n) if unit.startswith("min") else timedelta(hours=n))
+            elif unit.startswith("day"):
+                offer(today + timedelta(days=n), "offset")
+            elif unit.startswith("week"):
+                offer(today + timedelta(weeks=n), "offset")
+            else:
+                offer(_add_months(today, n), "offset")
+        elif kind == "end_of":
+            unit = _WORDS.findall(token)[-1]
+            if unit == "day":
+                offer(today, "end_of")
+                if clock is None:
+                    clock = time(23, 59)
+            elif unit == "week":
+                offer(today + timedelta(days=6 - today.weekday()), "end_of")
+            else:
+                offer(today.replace(day=calendar.monthrange(today.year, today.month)[1]), "end_of")
+        elif kind == "relative":
+            phrase = " ".join(token.split())
+            if phrase == "next month":
+                offer(_add_months(today, 1), "relative")
+            else:
+                offer(today + timedelta(days=RELATIVE_DAYS[phrase]), "relative")
+        else:
+            words = token.split()
+            delta = (WEEKDAYS[words[-1]] - today.weekday()) % 7
+            if words[0] == "next" and delta == 0:
+                delta = 7
+            offer(today + timedelta(days=delta), "weekday")
+
+    if moment is not None and best_date is None:
+        return moment.replace(second=0, microsecond=0), True
+    if best_date is None:
+        best_date = today + _ONE_DAY
+    if moment is not None and clock is None:
+        clock = moment.time().replace(second=0, microsecond=0)
+    return datetime.combine(best_date, clock or _MIDNIGHT), clock is not None
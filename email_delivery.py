@@ -0,0 +1,197 @@
+# email_delivery.py
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Delivery worker for the Brevo transactional email API. One pooled HTTP
+# session is shared by a small thread pool, retryable failures back off
+# exponentially, and several messages can go out in a single API call.
+
+BREVO_API_URL = os.environ.get("BREVO_API_URL", "https://api.brevo.com/v3/smtp/email")
+BREVO_API_KEY = os.environ.get("BREVO_API_KEY", "replace the api key")
+SENDER_EMAIL = os.environ.get("BREVO_SENDER_EMAIL", "mailid@gmail.com")
+SENDER_NAME = os.environ.get("BREVO_SENDER_NAME", "Task Manager Bot")
+
+# Brevo accepts up to 1000 message versions per request
+MAX_BATCH_SIZE = 1000
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class EmailDeliveryError(Exception):
+    """Raised when a batch could not be delivered."""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class DeliveryWorker:
+    def __init__(self, api_key=BREVO_API_KEY, sender_email=SENDER_EMAIL, sender_name=SENDER_NAME,
+                 api_url=BREVO_API_URL, max_workers=4, max_retries=4, backoff_seconds=0.5,
+                 max_backoff_seconds=30.0, timeout=(3.05, 10)):
+        self.api_key = api_key
+        self.sender = {"name": sender_name, "email": sender_email}
+        self.api_url = api_url
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "accept": "application/json",
+            "content-type": "application/json",
+            "api-key": api_key
+        })
+        # The pool size bounds how many requests are in flight at once
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="email-delivery")
+
+        self._lock = threading.Lock()
+        self._latencies = []
+        self._stats = {
+            "requests": 0,
+            "retries": 0,
+            "messages_sent": 0,
+            "messages_failed": 0,
+            "batches_failed": 0,
+        }
+
+    def _payload(self, messages):
+        first = messages[0]
+        payload = {
+            "sender": self.sender,
+            "subject": first["subject"],
+            "htmlContent": first["html_content"],
+        }
+        if len(messages) == 1:
+            payload["to"] = [{"email": first["recipient_email"], "name": first.get("recipient_name", "User")}]
+        else:
+            payload["messageVersions"] = [
+                {
+                    "to": [{"email": m["recipient_email"], "name": m.get("recipient_name", "User")}],
+                    "subject": m["subject"],
+                    "htmlContent": m["html_content"],
+                }
+                for m in messages
+            ]
+        return payload
+
+    def _retry_delay(self, attempt, response=None):
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff_seconds)
+        delay = self.backoff_seconds * (2 ** attempt)
+        # Full jitter keeps parallel workers from retrying in lockstep
+        return random.uniform(0, min(delay, self.max_backoff_seconds))
+
+    def _post(self, payload):
+        for attempt in range(self.max_retries + 1):
+            response = error = None
+            start = time.perf_counter()
+            try:
+                response = self.session.post(self.api_url, json=payload, timeout=self.timeout)
+                retryable = response.status_code in RETRYABLE_STATUS
+            except requests.ConnectionError as e:
+                # Includes ConnectTimeout: the request never reached the API,
+                # so sending it again cannot duplicate an email
+                error, retryable = e, True
+            except requests.RequestException as e:
+                # e.g. ReadTimeout: Brevo may already have accepted the
+                # request, and a retry could email the same people twice
+                error, retryable = e, False
+            elapsed = time.perf_counter() - start
+
+            with self._lock:
+                self._stats["requests"] += 1
+                self._latencies.append(elapsed)
+                del self._latencies[:-1000]
+
+            if response is not None and response.status_code in (200, 201, 202):
+                return response
+            if not retryable or attempt == self.max_retries:
+                if error is not None:
+                    raise EmailDeliveryError(f"Email failed: {error}")
+                raise EmailDeliveryError(
+                    f"Email failed: {response.status_code} - {response.text}", response.status_code
+                )
+
+            with self._lock:
+                self._stats["retries"] += 1
+            time.sleep(self._retry_delay(attempt, response))
+
+    def send_batch(self, messages):
+        """
+        Deliver a list of messages (dicts with recipient_email, subject and
+        html_content) using as few API calls as possible. Blocks until done.
+        Returns one outcome per message, in order: None if it was delivered,
+        otherwise the EmailDeliveryError of its API call. A failed call does
+        not stop the ones after it.
+        """
+        outcomes = []
+        for i in range(0, len(messages), MAX_BATCH_SIZE):
+            chunk = messages[i:i + MAX_BATCH_SIZE]
+            try:
+                self._post(self._payload(chunk))
+                error = None
+            except EmailDeliveryError as e:
+                error = e
+            with self._lock:
+                if error is None:
+                    self._stats["messages_sent"] += len(chunk)
+                else:
+                    self._stats["messages_failed"] += len(chunk)
+                    self._stats["batches_failed"] += 1
+            outcomes.extend([error] * len(chunk))
+        return outcomes
+
+    def submit(self, messages, callback=None):
+        """
+        Queue a batch on the worker pool. The future's result is send_batch's
+        list of outcomes, and callback(outcomes) runs when it finishes.
+        """
+        def run():
+            try:
+                outcomes = self.send_batch(messages)
+            except Exception as e:
+                if callback:
+                    callback([e] * len(messages))
+                raise
+            if callback:
+                callback(outcomes)
+            return outcomes
+        return self.executor.submit(run)
+
+    def stats(self):
+        """Request/retry/failure counters plus latency percentiles in milliseconds."""
+        with self._lock:
+            stats = dict(self._stats)
+            latencies = sorted(self._latencies)
+        for name, q in (("latency_p50_ms", 0.50), ("latency_p95_ms", 0.95)):
+            stats[name] = round(latencies[int(q * (len(latencies) - 1))] * 1000, 1) if latencies else None
+        return stats
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.session.close()
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_worker():
+    """Process-wide delivery worker, created on first use."""
+    global _worker
+    if _worker is None:
+        with _worker_lock:
+            if _worker is None:
+                _worker = DeliveryWorker()
+    return _worker
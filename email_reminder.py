@@ -1,32 +1,140 @@
 # email_reminder.py
 import streamlit as st
-from apscheduler.schedulers.background import BackgroundScheduler
 from datetime import datetime, timedelta
 import atexit
-import requests
-
-scheduler = BackgroundScheduler()
-scheduler.start()
-atexit.register(lambda: scheduler.shutdown(wait=False))
-
-def send_email_via_brevo(api_key, sender_email, sender_name, recipient_email, recipient_name, subject, html_content):
-    url = "https://api.brevo.com/v3/smtp/email"
-    payload = {
-        "sender": {"name": sender_name, "email": sender_email},
-        "to": [{"email": recipient_email, "name": recipient_name}],
-        "subject": subject,
-        "htmlContent": html_content
-    }
-    headers = {
-        "accept": "application/json",
-        "content-type": "application/json",
-        "api-key": api_key
+import os
+import threading
+
+from database import (
+    save_reminder, get_pending_reminders, claim_reminders, release_stuck_reminders,
+    mark_reminder, mark_reminders, reminder_task_key
+)
+
+# The scheduler thread (and APScheduler itself) is only started once a
+# reminder actually needs scheduling; importing this module is cheap.
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+# What to do with a reminder whose send time passed while the app was down:
+# "send" delivers it late (unless it is more than MAX_LATENESS overdue),
+# "drop" discards it.
+LATE_POLICY = os.environ.get("REMINDER_LATE_POLICY", "send")
+MAX_LATENESS = timedelta(hours=int(os.environ.get("REMINDER_MAX_LATENESS_HOURS", "24")))
+# A claimed ('sending') reminder older than this is taken to belong to a
+# process that died mid-delivery; younger claims may still be in flight in
+# another process (a second Streamlit worker, the CLI). It must outlast a
+# delivery with every retry.
+CLAIM_LEASE = timedelta(minutes=int(os.environ.get("REMINDER_CLAIM_LEASE_MINUTES", "15")))
+
+
+def get_scheduler():
+    """Process-wide background scheduler, started on first use."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                from apscheduler.schedulers.background import BackgroundScheduler
+                scheduler = BackgroundScheduler()
+                scheduler.start()
+                atexit.register(lambda: scheduler.shutdown(wait=False))
+                _scheduler = scheduler
+    return _scheduler
+
+
+def _message(reminder):
+    return {
+        "recipient_email": reminder["recipient_email"],
+        "recipient_name": "User",
+        "subject": reminder["subject"],
+        "html_content": reminder["html_content"],
     }
-    response = requests.post(url, json=payload, headers=headers)
-    if response.status_code == 201:
-        return True
-    else:
-        raise Exception(f"Email failed: {response.status_code} - {response.text}")
+
+
+def _record_outcome(reminders):
+    def done(outcomes):
+        # Only the reminders in a failed API call are marked failed; the rest
+        # of the batch was delivered and must not be sent again
+        sent, failed = [], {}
+        for reminder, error in zip(reminders, outcomes):
+            if error is None:
+                sent.append(reminder["reminder_id"])
+            else:
+                failed.setdefault(str(error), []).append(reminder["reminder_id"])
+        if sent:
+            mark_reminders(sent, "sent")
+        for error, ids in failed.items():
+            print(f"[email_reminder] Delivery of reminders {ids} failed: {error}")
+            mark_reminders(ids, "failed", error)
+    return done
+
+
+def deliver_reminders(reminders, wait=False):
+    """
+    Send already-claimed reminders as one batch on the delivery worker and
+    record the outcome. Returns the worker future; with wait=True, blocks
+    until delivery finishes.
+    """
+    if not reminders:
+        return None
+    from email_delivery import get_worker
+    future = get_worker().submit([_message(r) for r in reminders], callback=_record_outcome(reminders))
+    if wait:
+        future.result()
+    return future
+
+
+def deliver_due_reminders(due_by):
+    """Scheduler job: send every pending reminder due by the given time in one batch."""
+    reminders = claim_reminders(due_by=due_by.strftime("%Y-%m-%d %H:%M:%S"))
+    return deliver_reminders(reminders)
+
+
+def _bucket(send_at):
+    """The first whole minute at or after send_at."""
+    minute = send_at.replace(second=0, microsecond=0)
+    return minute if minute == send_at else minute + timedelta(minutes=1)
+
+
+def schedule_reminder(send_at):
+    # One job per minute: every reminder due in the minute up to the job's
+    # run time goes out together, never early and at most 59 s late, and
+    # rescheduling the same minute replaces the job instead of adding one
+    bucket = _bucket(send_at)
+    get_scheduler().add_job(
+        deliver_due_reminders, trigger='date', run_date=bucket,
+        args=[bucket],
+        id=f"reminders-{bucket.strftime('%Y%m%d%H%M')}", replace_existing=True,
+        misfire_grace_time=int(MAX_LATENESS.total_seconds())
+    )
+
+
+def restore_reminders(now=None):
+    """
+    Re-schedule every pending reminder from the database. Reminders that came
+    due while the process was down are sent or dropped according to LATE_POLICY,
+    and claims older than CLAIM_LEASE are released first. Returns counts of
+    what was done.
+    """
+    now = now or datetime.now()
+    counts = {"scheduled": 0, "sent": 0, "dropped": 0}
+    release_stuck_reminders(claimed_before=(now - CLAIM_LEASE).strftime("%Y-%m-%d %H:%M:%S"))
+    late = []
+    for reminder in get_pending_reminders():
+        send_at = datetime.strptime(reminder["send_at"], "%Y-%m-%d %H:%M:%S")
+        if send_at > now:
+            schedule_reminder(send_at)
+            counts["scheduled"] += 1
+        elif LATE_POLICY == "send" and now - send_at <= MAX_LATENESS:
+            late.append(reminder["reminder_id"])
+        else:
+            mark_reminder(reminder["reminder_id"], "dropped", f"missed send time {reminder['send_at']}")
+            counts["dropped"] += 1
+    if late:
+        claimed = claim_reminders(reminder_ids=late)
+        deliver_reminders(claimed)
+        counts["sent"] = len(claimed)
+    return counts
+
 
 def handle_email_reminder(task, notify_email, snooze_minutes, custom_message):
     try:
@@ -48,23 +156,40 @@ def handle_email_reminder(task, notify_email, snooze_minutes, custom_message):
         </html>
         """
 
-        def send_now():
-            send_email_via_brevo(
-                api_key="replace the api key",
-                sender_email="mailid@gmail.com",
-                sender_name="Task Manager Bot",
-                recipient_email=notify_email,
-                recipient_name="User",
-                subject=subject,
-                html_content=html_content
-            )
+        reminder_id = save_reminder(
+            reminder_task_key(task), notify_email, subject, html_content,
+            send_time.strftime("%Y-%m-%d %H:%M:%S")
+        )
 
         if send_time > datetime.now():
-            scheduler.add_job(send_now, trigger='date', run_date=send_time)
+            schedule_reminder(send_time)
             st.success(f"✅ Reminder scheduled for {send_time.strftime('%Y-%m-%d %H:%M')}")
         else:
-            send_now()
-            st.success("✅ Reminder sent immediately")
+            # Hand off to the delivery worker instead of blocking this rerun
+            deliver_reminders(claim_reminders(reminder_ids=[reminder_id]))
+            st.success("✅ Reminder queued for immediate delivery")
 
     except Exception as e:
         st.error(f"Failed to schedule reminder: {e}")
+
+
+def get_delivery_stats():
+    from email_delivery import get_worker
+    return get_worker().stats()
+
+
+_restored = False
+
+
+def restore_reminders_once():
+    """Pick up reminders saved by earlier runs of the app, once per process."""
+    global _restored
+    with _scheduler_lock:
+        if _restored:
+            return None
+        _restored = True
+    try:
+        return restore_reminders()
+    except Exception as e:
+        print(f"[email_reminder] Could not restore reminders: {e}")
+        return None
@@ -0,0 +1,75 @@
+# keyword_matcher.py
+import re
+
+# Whole-word multi-keyword matching. The keywords of a table are merged into
+# a character trie and emitted as one regex, so shared prefixes are tested
+# once and a text is scanned a single time however large the vocabulary.
+
+
+def _trie_pattern(node):
+    end = "" in node
+    branches = [
+        (r"\s+" if char == " " else re.escape(char)) + _trie_pattern(child)
+        for char, child in sorted(node.items()) if char
+    ]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if end:
+        # The keyword may stop here; a longer one wins when it also matches
+        if len(branches) == 1 and len(branches[0]) > 1:
+            body = "(?:" + body + ")"
+        body += "?"
+    return body
+
+
+def _normalize(keyword):
+    return " ".join(keyword.lower().split())
+
+
+class KeywordMatcher:
+    """
+    Compiled matcher for a {keyword: value} table. Matching is
+    case-insensitive and whole-word ("email" does not match "emailing");
+    multi-word keywords match across any whitespace. Keywords earlier in the
+    table take precedence in first().
+    """
+
+    def __init__(self, table):
+        self.table = {}
+        for keyword, value in table.items():
+            self.table.setdefault(_normalize(keyword), value)
+        self._rank = {keyword: i for i, keyword in enumerate(self.table)}
+
+        trie = {}
+        for keyword in self.table:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = True
+        self.pattern = re.compile(r"(?<!\w)" + _trie_pattern(trie) + r"(?!\w)") if trie else None
+
+    @classmethod
+    def from_groups(cls, groups):
+        """Build from {value: [keywords]}, e.g. the category keyword lists."""
+        table = {}
+        for value, keywords in groups.items():
+            for keyword in keywords:
+                table.setdefault(keyword, value)
+        return cls(table)
+
+    def find_all(self, text):
+        """Every (keyword, value) hit in the text, in text order."""
+        if self.pattern is None:
+            return []
+        return [
+            (keyword, self.table[keyword])
+            for keyword in (_normalize(m.group()) for m in self.pattern.finditer(text.lower()))
+        ]
+
+    def first(self, text, default=None):
+        """Value of the highest-precedence keyword present in the text."""
+        hits = [keyword for keyword, _ in self.find_all(text)]
+        if not hits:
+            return default
+        return self.table[min(hits, key=self._rank.__getitem__)]
@@ -0,0 +1,132 @@
+# linear_inference.py
+import json
+import re
+import zipfile
+
+import numpy as np
+
+# Pure-NumPy scoring for a TF-IDF + linear classifier exported by
+# mlmodel.export_linear_model(). The app can categorize tasks without importing
+# scikit-learn or unpickling anything: arrays are memory-mapped straight out
+# of the (uncompressed) .npz file and a batch is scored with one sparse dot
+# product.
+
+FORMAT_VERSION = 1
+
+
+def _memmap_npz(path):
+    """
+    Map every array of an uncompressed .npz file read-only. np.load ignores
+    mmap_mode for .npz archives, so each member's data offset is located by
+    hand; object arrays are not supported.
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as f:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{path} is compressed; export it with np.savez, not savez_compressed")
+            # Local file header: 30 fixed bytes, then file name and extra field
+            f.seek(info.header_offset + 26)
+            name_len, extra_len = np.frombuffer(f.read(4), dtype='<u2')
+            f.seek(info.header_offset + 30 + int(name_len) + int(extra_len))
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            name = info.filename[:-4] if info.filename.endswith('.npy') else info.filename
+            if dtype.hasobject:
+                raise ValueError(f"{path}: array {name!r} has object dtype")
+            arrays[name] = np.memmap(path, dtype=dtype, mode='r', offset=f.tell(), shape=shape,
+                                     order='F' if fortran_order else 'C')
+    return arrays
+
+
+class LinearCategorizer:
+    """
+    TF-IDF features and softmax(X @ W.T + b) scores, reproducing
+    TfidfVectorizer plus LogisticRegression / MultinomialNB. Exposes
+    transform/predict/predict_proba so it can stand in for the sklearn
+    vectorizer and model.
+    """
+
+    def __init__(self, path):
+        arrays = _memmap_npz(path)
+        if int(arrays["format_version"][()]) != FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported export format {int(arrays['format_version'][()])}")
+        self.path = path
+        self.classes_ = np.array(arrays["classes"])
+        self.coef = arrays["coef"]
+        self.intercept = arrays["intercept"]
+        self.idf = arrays["idf"] if arrays["idf"].size else None
+        self.token_pattern = re.compile(str(arrays["token_pattern"][()]))
+        self.min_n, self.max_n = (int(n) for n in arrays["ngram_range"])
+        self.lowercase = bool(arrays["lowercase"][()])
+        self.sublinear_tf = bool(arrays["sublinear_tf"][()])
+        self.norm = str(arrays["norm"][()])
+        self.stop_words = frozenset(str(word) for word in arrays["stop_words"])
+        self.vocabulary = {str(term): i for i, term in enumerate(arrays["vocabulary"])}
+        self.metadata = json.loads(str(arrays["metadata"][()]))
+
+    def _ngrams(self, text):
+        if self.lowercase:
+            text = text.lower()
+        tokens = [t for t in self.token_pattern.findall(text) if t not in self.stop_words]
+        grams = list(tokens) if self.min_n == 1 else []
+        for n in range(max(self.min_n, 2), min(self.max_n, len(tokens)) + 1):
+            grams.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return grams
+
+    def transform(self, texts):
+        """CSR features as (data, indices, indptr), l2-normalised TF-IDF."""
+        data, indices, indptr = [], [], [0]
+        for text in texts:
+            counts = {}
+            for gram in self._ngrams(text):
+                column = self.vocabulary.get(gram)
+                if column is not None:
+                    counts[column] = counts.get(column, 0) + 1
+            columns = sorted(counts)
+            indices.extend(columns)
+            data.extend(counts[c] for c in columns)
+            indptr.append(len(indices))
+
+        data = np.asarray(data, dtype=np.float64)
+        indices = np.asarray(indices, dtype=np.intp)
+        indptr = np.asarray(indptr, dtype=np.intp)
+        if self.sublinear_tf:
+            np.log(data, out=data)
+            data += 1
+        if self.idf is not None:
+            data *= self.idf[indices]
+        if self.norm == "l2" and data.size:
+            lengths = np.diff(indptr)
+            row_norms = np.sqrt(np.add.reduceat(data * data, indptr[:-1][lengths > 0]))
+            data /= np.repeat(row_norms, lengths[lengths > 0])
+        return data, indices, indptr
+
+    def decision_function(self, features):
+        data, indices, indptr = features
+        scores = np.zeros((len(indptr) - 1, len(self.classes_)))
+        rows = np.diff(indptr) > 0
+        if rows.any():
+            # Sparse (n_texts x n_terms) @ dense (n_terms x n_classes): scale
+            # each non-zero's weight row, then sum the rows of each text
+            products = data[:, None] * self.coef[:, indices].T
+            scores[rows] = np.add.reduceat(products, indptr[:-1][rows], axis=0)
+        scores += self.intercept
+        return scores
+
+    def predict(self, features):
+        return self.classes_[self.decision_function(features).argmax(axis=1)]
+
+    def predict_proba(self, features):
+        scores = self.decision_function(features)
+        scores -= scores.max(axis=1, keepdims=True)
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1, keepdims=True)
+        return scores
+
+
+def load(path):
+    return LinearCategorizer(path)
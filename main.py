@@ -9,16 +9,27 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# ✅ Only now import others
+# ✅ Only now import others. Page modules (and the heavy libraries behind
+# them: spaCy, pandas, plotly, matplotlib, wordcloud, APScheduler, requests)
+# are imported inside main() by the page that needs them.
 from utils import initialize_session_defaults
 initialize_session_defaults()
 
-from agent import AdvancedTaskAgent
-from database import *
-from ui_components import *
-from analytics import create_advanced_dashboard
-from email_reminder import handle_email_reminder
-from datetime import datetime
+PAGES = ["📝 Add Task", "📋 All Tasks", "✅ Completed", "⏰ Overdue", "📊 Analytics"]
+
+
+def start_background_services():
+    """
+    Restore saved reminders, start the online learner and build (and warm
+    up) the shared agent, once per process.
+    """
+    from agent import get_agent
+    from email_reminder import restore_reminders_once
+    from online_learner import start_background_learner
+    restore_reminders_once()
+    start_background_learner()
+    get_agent()
+
 
 def main():
     st.title(":robot_face: Advanced AI Task Manager")
@@ -26,29 +37,36 @@ def main():
 
     initialize_session_defaults()
 
-    agent = AdvancedTaskAgent()
-
     # Ensure database connection is alive before navigation
-    from database import get_all_tasks
-    _ = get_all_tasks()  # Force initial DB read to warm up cache/connection
+    from database import get_connection
+    get_connection()
 
     st.sidebar.title("Navigation")
-    page = st.sidebar.selectbox("Choose a page:", [
-        "📝 Add Task", "📋 All Tasks", "✅ Completed", "⏰ Overdue", "📊 Analytics"])
+    page = st.sidebar.selectbox("Choose a page:", PAGES)
 
     if page == "📝 Add Task":
-        show_add_task_page(agent)
+        from agent import get_agent
+        from ui_components import show_add_task_page
+        show_add_task_page(get_agent())
     elif page == "📋 All Tasks":
-        show_all_tasks_page(agent)
+        from agent import get_agent
+        from ui_components import show_all_tasks_page
+        show_all_tasks_page(get_agent())
     elif page == "✅ Completed":
+        from ui_components import show_completed_tasks_page
         show_completed_tasks_page()
     elif page == "⏰ Overdue":
+        from ui_components import show_overdue_tasks_page
         show_overdue_tasks_page()
     elif page == "📊 Analytics":
+        from analytics import create_advanced_dashboard
         create_advanced_dashboard()
 
     st.sidebar.markdown("---")
     st.sidebar.markdown("*Powered by NLP & ML intelligence*")
 
+    # After the page is drawn, so none of this delays the first paint
+    start_background_services()
+
 if __name__ == "__main__":
     main()
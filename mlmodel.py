@@ -1,123 +1,34 @@
-import pandas as pd
-import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.naive_bayes import MultinomialNB
-from sklearn.linear_model import LogisticRegression
-from sklearn.svm import SVC
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+# mlmodel.py
+import argparse
+import hashlib
+import json
+import os
 import pickle
 import re
+import sys
+import time
 
+import pandas as pd
 
-df = pd.read_csv('unique_tasks_dataset.csv')
-print(f"Dataset shape: {df.shape}")
-print(f"Categories: {df['label'].unique()}")
-print(f"Label distribution:\n{df['label'].value_counts()}")
-
-# Text preprocessing function
-def preprocess_text(text):
-    
-    text = text.lower()
-   
-    text = re.sub(r'[^a-zA-Z\s]', '', text)
-  
-    text = ' '.join(text.split())
-    return text
-
-
-df['text_clean'] = df['text'].apply(preprocess_text)
-print("Text preprocessing completed")
-
-X = df['text_clean']
-y = df['label']
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
-
-print(f"Training samples: {len(X_train)}")
-print(f"Testing samples: {len(X_test)}")
-
-
-
-tfidf = TfidfVectorizer(max_features=5000, stop_words='english', ngram_range=(1, 2))
-X_train_tfidf = tfidf.fit_transform(X_train)
-X_test_tfidf = tfidf.transform(X_test)
-
-print(f"Feature matrix shape: {X_train_tfidf.shape}")
-
-
-models = {
-    'Naive Bayes': MultinomialNB(),
-    'Logistic Regression': LogisticRegression(random_state=42, max_iter=1000),
-    'SVM': SVC(random_state=42),
-    'Random Forest': RandomForestClassifier(random_state=42, n_estimators=100)
-}
-
-results = {}
-
-for name, model in models.items():
-    print(f"\nTraining {name}...")
-    model.fit(X_train_tfidf, y_train)
-
-    # Predictions
-    y_pred = model.predict(X_test_tfidf)
-
-    # Accuracy
-    accuracy = accuracy_score(y_test, y_pred)
-    results[name] = accuracy
-
-    print(f"{name} Accuracy: {accuracy:.4f}")
-
-# Find best model
-best_model_name = max(results, key=results.get)
-best_model = models[best_model_name]
-print(f"\n=== BEST MODEL: {best_model_name} (Accuracy: {results[best_model_name]:.4f}) ===")
-
-y_pred_best = best_model.predict(X_test_tfidf)
-print("\nClassification Report:")
-print(classification_report(y_test, y_pred_best))
-
-with open('task_categorizer_model.pkl', 'wb') as f:
-    pickle.dump(best_model, f)
-
-with open('tfidf_vectorizer.pkl', 'wb') as f:
-    pickle.dump(tfidf, f)
-
-print("Model and vectorizer saved successfully!")
-
-
-def categorize_task(task_text):
-
-    with open('task_categorizer_model.pkl', 'rb') as f:
-        model = pickle.load(f)
-    with open('tfidf_vectorizer.pkl', 'rb') as f:
-        vectorizer = pickle.load(f)
-
-    # Preprocess the input
-    clean_text = preprocess_text(task_text)
-
-    # Transform to features
-    text_tfidf = vectorizer.transform([clean_text])
-
-    # Predict
-    prediction = model.predict(text_tfidf)[0]
-    probability = model.predict_proba(text_tfidf)[0]
-
-    # Get confidence score
-    confidence = max(probability)
-
-    return prediction, confidence
-
-
-test_task = "conducting a interview on 10pm"
-category, confidence = categorize_task(test_task)
-
-print(f"Input task: '{test_task}'")
-print(f"Predicted category: {category}")
-print(f"Confidence: {confidence:.4f}")
-
-
-test_cases = [
+# Training pipeline for the task categorizer. Importing this module has no
+# side effects; run it as a script (or call train()) to fit TF-IDF +
+# classifier pipelines, pick the best by cross-validation and save one
+# versioned artifact to models/.
+#
+#   python mlmodel.py
+#   python mlmodel.py --n-jobs 4 --cv 5 --demo
+#   python mlmodel.py --export-linear   # also write the NumPy-only model
+#   python mlmodel.py --linear-only     # choose among linear models and export the winner
+
+DATASET = "unique_tasks_dataset.csv"
+MODEL_DIR = "models"
+ARTIFACT_NAME = "task_categorizer.pkl"
+METADATA_NAME = "task_categorizer.json"
+LINEAR_EXPORT_NAME = "task_categorizer.npz"
+LINEAR_MODELS = ("LogisticRegression", "MultinomialNB")
+RANDOM_STATE = 42
+
+SAMPLE_TASKS = [
     "conducting a interview on 10pm",
     "buy groceries from the store",
     "doctor appointment at 2pm",
@@ -130,39 +41,257 @@ test_cases = [
     "meet friends for dinner"
 ]
 
-for i, task in enumerate(test_cases, 1):
-    category, confidence = categorize_task(task)
-    print(f"{i}. '{task}' → {category} (confidence: {confidence:.3f})")
-
-
-print("Files saved:")
-print("- task_categorizer_model.pkl")
-print("- tfidf_vectorizer.pkl")
-print("\nUse the categorize_task() function to classify new tasks!")
 
-
-#trying 
-import pickle
-import re
-
-def predict_category(task_text):
-   
-    with open('task_categorizer_model.pkl', 'rb') as f:
-        model = pickle.load(f)
-    with open('tfidf_vectorizer.pkl', 'rb') as f:
-        vectorizer = pickle.load(f)
-
-  
-    clean_text = task_text.lower()
-    clean_text = re.sub(r'[^a-zA-Z\s]', '', clean_text)
-
-
-    features = vectorizer.transform([clean_text])
-    category = model.predict(features)[0]
-
-    return category
-
-
-task = "medical checkup"
-result = predict_category(task)
-print(result)
\ No newline at end of file
+def preprocess_text(text):
+    """Lowercase, keep letters only, collapse whitespace (same as agent.normalize_task_text)."""
+    text = text.lower()
+    text = re.sub(r'[^a-zA-Z\s]', '', text)
+    return ' '.join(text.split())
+
+
+def dataset_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def candidate_grid(random_state=RANDOM_STATE, linear_only=False):
+    """
+    The pipeline and the parameter grid searched over it. Each grid entry
+    swaps in one classifier, so model selection and tuning share one
+    cross-validation run. linear_only keeps only the LINEAR_MODELS entries.
+    """
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.naive_bayes import MultinomialNB
+    from sklearn.pipeline import Pipeline
+    from sklearn.svm import SVC
+
+    pipeline = Pipeline([
+        ("tfidf", TfidfVectorizer(max_features=5000, stop_words='english', ngram_range=(1, 2))),
+        ("clf", MultinomialNB()),
+    ])
+    grid = [
+        {"clf": [MultinomialNB()], "clf__alpha": [0.1, 0.5, 1.0]},
+        {"clf": [LogisticRegression(random_state=random_state, max_iter=1000)], "clf__C": [1.0, 10.0]},
+        # probability=True so the app can report a confidence
+        {"clf": [SVC(random_state=random_state, probability=True)]},
+        {"clf": [RandomForestClassifier(random_state=random_state, n_estimators=100)]},
+    ]
+    if linear_only:
+        grid = [entry for entry in grid if _model_name(entry["clf"][0]) in LINEAR_MODELS]
+    return pipeline, grid
+
+
+def _model_name(estimator):
+    return type(estimator).__name__
+
+
+def train(dataset=DATASET, model_dir=MODEL_DIR, n_jobs=-1, cv=5, test_size=0.2,
+          random_state=RANDOM_STATE, verbose=True, export_linear=False, linear_only=False):
+    """
+    Fit and cross-validate every candidate in parallel, refit the best on
+    the training split, score it on the held-out split and save
+    {"pipeline", "metadata"} to model_dir. With export_linear, the best
+    model is also exported for linear_inference if it is linear; otherwise
+    no .npz is written and any older one is removed, so the app always
+    serves the model that won cross-validation. linear_only restricts the
+    candidates to LINEAR_MODELS, so the winner can always be exported.
+    Returns the metadata.
+    """
+    import sklearn
+    from sklearn.metrics import accuracy_score, classification_report
+    from sklearn.model_selection import GridSearchCV, StratifiedKFold, train_test_split
+
+    log = print if verbose else (lambda *args, **kwargs: None)
+    start = time.perf_counter()
+
+    df = pd.read_csv(dataset)
+    X = df['text'].astype(str).map(preprocess_text)
+    y = df['label']
+    log(f"Dataset: {len(df)} rows, {y.nunique()} categories")
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, random_state=random_state, stratify=y
+    )
+
+    pipeline, grid = candidate_grid(random_state, linear_only)
+    search = GridSearchCV(
+        pipeline, grid, scoring="accuracy", n_jobs=n_jobs,
+        cv=StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state),
+    )
+    search.fit(X_train, y_train)
+
+    cv_results = {}
+    for params, score in zip(search.cv_results_["params"], search.cv_results_["mean_test_score"]):
+        name = _model_name(params["clf"])
+        cv_results[name] = max(cv_results.get(name, 0.0), float(score))
+    for name, score in sorted(cv_results.items(), key=lambda item: -item[1]):
+        log(f"{name}: CV accuracy {score:.4f}")
+
+    best = search.best_estimator_
+    y_pred = best.predict(X_test)
+    accuracy = float(accuracy_score(y_test, y_pred))
+    log(f"\n=== BEST MODEL: {_model_name(best.named_steps['clf'])} (test accuracy {accuracy:.4f}) ===")
+    log(classification_report(y_test, y_pred))
+
+    digest = dataset_hash(dataset)
+    metadata = {
+        "version": time.strftime("%Y%m%d%H%M%S") + "-" + digest[:8],
+        "model": _model_name(best.named_steps['clf']),
+        "params": {k: v for k, v in search.best_params_.items() if k != "clf"},
+        "cv_accuracy": round(float(search.best_score_), 4),
+        "cv_results": {name: round(score, 4) for name, score in cv_results.items()},
+        "linear_only": linear_only,
+        "test_accuracy": round(accuracy, 4),
+        "labels": [str(label) for label in best.classes_],
+        "training_samples": len(X_train),
+        "test_samples": len(X_test),
+        "dataset": os.path.basename(dataset),
+        "dataset_sha256": digest,
+        "training_seconds": round(time.perf_counter() - start, 2),
+        "trained_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "sklearn_version": sklearn.__version__,
+    }
+    save_artifact(best, metadata, model_dir)
+    log(f"Saved model {metadata['version']} to {os.path.join(model_dir, ARTIFACT_NAME)}")
+
+    # The registry serves the .npz when it is at least as new as the artifact,
+    # so it is only ever written for the model that was just saved
+    if export_linear:
+        path = os.path.join(model_dir, LINEAR_EXPORT_NAME)
+        if metadata["model"] not in LINEAR_MODELS:
+            if os.path.exists(path):
+                os.remove(path)
+            log(f"Not exporting {LINEAR_EXPORT_NAME}: the best model is {metadata['model']}, "
+                f"not {' or '.join(LINEAR_MODELS)} (use --linear-only to choose among those)")
+        else:
+            export_linear_model(best, path, metadata)
+            mismatches = verify_linear_export(best, path, X)
+            if mismatches:
+                os.remove(path)
+                raise RuntimeError(f"Linear export disagrees with sklearn on {mismatches} of {len(X)} texts")
+            log(f"Exported {metadata['model']} to {path} (matches sklearn on all {len(X)} texts)")
+    return metadata
+
+
+def export_linear_model(pipeline, path, metadata=None):
+    """
+    Write a fitted TfidfVectorizer + LogisticRegression/MultinomialNB
+    pipeline as an uncompressed .npz that linear_inference can memory-map.
+    """
+    import numpy as np
+    from linear_inference import FORMAT_VERSION
+
+    vectorizer, clf = pipeline.named_steps['tfidf'], pipeline.named_steps['clf']
+    if _model_name(clf) == "MultinomialNB":
+        coef, intercept = clf.feature_log_prob_, clf.class_log_prior_
+    elif _model_name(clf) == "LogisticRegression" and clf.coef_.shape[0] > 1:
+        coef, intercept = clf.coef_, clf.intercept_
+    else:
+        raise ValueError(f"Cannot export {_model_name(clf)}; expected multiclass {' or '.join(LINEAR_MODELS)}")
+    if vectorizer.analyzer != "word" or callable(vectorizer.preprocessor) or callable(vectorizer.tokenizer):
+        raise ValueError("Only the default word analyzer can be exported")
+
+    vocabulary = [None] * len(vectorizer.vocabulary_)
+    for term, index in vectorizer.vocabulary_.items():
+        vocabulary[index] = term
+    stop_words = vectorizer.get_stop_words() or ()
+    arrays = {
+        "format_version": np.array(FORMAT_VERSION),
+        "classes": np.array([str(c) for c in clf.classes_]),
+        "coef": np.ascontiguousarray(coef, dtype=np.float64),
+        "intercept": np.ascontiguousarray(intercept, dtype=np.float64),
+        "idf": vectorizer.idf_ if vectorizer.use_idf else np.empty(0),
+        "vocabulary": np.array(vocabulary),
+        "stop_words": np.array(sorted(stop_words)),
+        "token_pattern": np.array(vectorizer.token_pattern),
+        "ngram_range": np.array(vectorizer.ngram_range),
+        "lowercase": np.array(vectorizer.lowercase),
+        "sublinear_tf": np.array(vectorizer.sublinear_tf),
+        "norm": np.array(vectorizer.norm or ""),
+        "metadata": np.array(json.dumps(metadata or {})),
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path + ".tmp", 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def verify_linear_export(pipeline, path, cleaned_texts):
+    """Number of texts where the exported model's prediction differs from the pipeline's."""
+    from linear_inference import LinearCategorizer
+
+    linear = LinearCategorizer(path)
+    texts = list(cleaned_texts)
+    expected = pipeline.predict(texts)
+    actual = linear.predict(linear.transform(texts))
+    return int((expected != actual).sum())
+
+
+def save_artifact(pipeline, metadata, model_dir=MODEL_DIR):
+    """
+    Write the artifact and a JSON copy of its metadata. Files are written
+    under a temporary name and renamed, so the running app never loads a
+    half-written model.
+    """
+    os.makedirs(model_dir, exist_ok=True)
+    path = os.path.join(model_dir, ARTIFACT_NAME)
+    with open(path + ".tmp", 'wb') as f:
+        pickle.dump({"pipeline": pipeline, "metadata": metadata}, f)
+    os.replace(path + ".tmp", path)
+
+    meta_path = os.path.join(model_dir, METADATA_NAME)
+    with open(meta_path + ".tmp", 'w') as f:
+        json.dump(metadata, f, indent=2)
+    os.replace(meta_path + ".tmp", meta_path)
+    return path
+
+
+def load_artifact(model_dir=MODEL_DIR):
+    """Return (pipeline, metadata) from a saved artifact."""
+    with open(os.path.join(model_dir, ARTIFACT_NAME), 'rb') as f:
+        artifact = pickle.load(f)
+    return artifact["pipeline"], artifact["metadata"]
+
+
+def categorize_tasks(pipeline, texts):
+    """Return (category, confidence) for each text using a loaded pipeline."""
+    cleaned = [preprocess_text(text) for text in texts]
+    labels = pipeline.predict(cleaned)
+    confidences = pipeline.predict_proba(cleaned).max(axis=1)
+    return list(zip(labels, confidences))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the task categorizer")
+    parser.add_argument("--dataset", default=DATASET)
+    parser.add_argument("--model-dir", default=MODEL_DIR)
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Parallel CV workers (-1 = all cores)")
+    parser.add_argument("--cv", type=int, default=5, help="Cross-validation folds")
+    parser.add_argument("--test-size", type=float, default=0.2)
+    parser.add_argument("--demo", action="store_true", help="Categorize a few sample tasks afterwards")
+    parser.add_argument("--export-linear", action="store_true",
+                        help=f"Also export the best model to {LINEAR_EXPORT_NAME} for sklearn-free inference, if it is linear")
+    parser.add_argument("--linear-only", action="store_true",
+                        help=f"Only consider {' and '.join(LINEAR_MODELS)}, and export the winner")
+    args = parser.parse_args(argv)
+
+    metadata = train(args.dataset, args.model_dir, n_jobs=args.n_jobs, cv=args.cv,
+                     test_size=args.test_size, export_linear=args.export_linear or args.linear_only,
+                     linear_only=args.linear_only)
+    print(json.dumps({k: v for k, v in metadata.items() if k != "labels"}, indent=2))
+
+    if args.demo:
+        pipeline, _ = load_artifact(args.model_dir)
+        for i, (task, (category, confidence)) in enumerate(
+                zip(SAMPLE_TASKS, categorize_tasks(pipeline, SAMPLE_TASKS)), 1):
+            print(f"{i}. '{task}' → {category} (confidence: {confidence:.3f})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+# model_registry.py
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict, deque
+
+# Process-wide cache for the task categorizer. Every Streamlit session runs in
+# the same process, so the vectorizer and classifier are unpickled once and
+# shared; they are reloaded only when the files on disk change.
+#
+# mlmodel.py saves a single versioned artifact ({"pipeline", "metadata"});
+# the older separate model/vectorizer pickles are still read when no
+# artifact exists. A linear model exported with --export-linear is served by
+# linear_inference (no scikit-learn import) when it is at least as new as
+# the pickled artifact.
+
+LINEAR_PATH = os.path.join("models", "task_categorizer.npz")
+ARTIFACT_PATH = os.path.join("models", "task_categorizer.pkl")
+MODEL_PATH = os.path.join("models", "task_categorizer_model.pkl")
+VECTORIZER_PATH = os.path.join("models", "tfidf_vectorizer.pkl")
+
+# Users re-enter the same short tasks ("pay bills", "gym") all day, so
+# (label, confidence) results are memoised per normalised text
+CACHE_SIZE = int(os.environ.get("CATEGORY_CACHE_SIZE", "4096"))
+
+
+class ModelUnavailable(Exception):
+    """Raised when the categorizer files are not present on disk."""
+
+
+_lock = threading.Lock()
+# (file key, vectorizer, model, metadata), swapped as one tuple so readers
+# never see a vectorizer from one load paired with a model from another
+_loaded = None
+_stats = {
+    "loads": 0,
+    "load_seconds": 0.0,
+    "predictions": 0,
+    "predict_seconds": 0.0,
+    "cache_hits": 0,
+    "cache_misses": 0,
+}
+# Per-call latencies of recent model calls, for percentiles
+_latencies = deque(maxlen=1000)
+# normalised text -> (label, confidence); cleared whenever the model reloads
+_cache = OrderedDict()
+
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+def _file_key():
+    linear, artifact = _mtime(LINEAR_PATH), _mtime(ARTIFACT_PATH)
+    if linear is not None and (artifact is None or linear >= artifact):
+        return (LINEAR_PATH, linear)
+    if artifact is not None:
+        return (ARTIFACT_PATH, artifact)
+    try:
+        return (MODEL_PATH, os.path.getmtime(MODEL_PATH), os.path.getmtime(VECTORIZER_PATH))
+    except OSError:
+        raise ModelUnavailable(
+            f"Categorizer not found at {ARTIFACT_PATH} or {MODEL_PATH} / {VECTORIZER_PATH}"
+        )
+
+
+def _load(key):
+    if key[0] == LINEAR_PATH:
+        from linear_inference import LinearCategorizer
+        categorizer = LinearCategorizer(LINEAR_PATH)
+        # It is both the vectorizer (transform) and the model (predict)
+        return categorizer, categorizer, categorizer.metadata
+    if key[0] == ARTIFACT_PATH:
+        with open(ARTIFACT_PATH, 'rb') as f:
+            artifact = pickle.load(f)
+        pipeline = artifact["pipeline"]
+        return pipeline[:-1], pipeline[-1], artifact.get("metadata", {})
+    with open(MODEL_PATH, 'rb') as f:
+        model = pickle.load(f)
+    with open(VECTORIZER_PATH, 'rb') as f:
+        vectorizer = pickle.load(f)
+    return vectorizer, model, {"version": "legacy", "model": type(model).__name__}
+
+
+def get_categorizer():
+    """
+    Return the shared (vectorizer, model) pair, loading it on first use and
+    reloading it whenever the model files' mtimes change.
+    """
+    global _loaded
+    key = _file_key()
+    loaded = _loaded
+    if loaded is not None and loaded[0] == key:
+        return loaded[1], loaded[2]
+
+    with _lock:
+        # Another thread may have reloaded while we waited for the lock
+        if _loaded is None or _loaded[0] != key:
+            start = time.perf_counter()
+            _loaded = (key,) + _load(key)
+            _cache.clear()
+            _stats["loads"] += 1
+            _stats["load_seconds"] += time.perf_counter() - start
+        return _loaded[1], _loaded[2]
+
+
+def _run_model(vectorizer, model, cleaned_texts):
+    start = time.perf_counter()
+    features = vectorizer.transform(cleaned_texts)
+    labels = model.predict(features)
+    try:
+        confidences = model.predict_proba(features).max(axis=1)
+    except AttributeError:
+        # e.g. SVC trained without probability=True
+        confidences = [None] * len(cleaned_texts)
+    elapsed = time.perf_counter() - start
+    with _lock:
+        _stats["predictions"] += len(cleaned_texts)
+        _stats["predict_seconds"] += elapsed
+        _latencies.append(elapsed)
+    return [
+        (str(label), None if confidence is None else float(confidence))
+        for label, confidence in zip(labels, confidences)
+    ]
+
+
+def predict_with_confidence(cleaned_texts):
+    """
+    Categorize already-cleaned texts, returning (label, confidence) pairs
+    where confidence is the top class probability (None if the model has no
+    predict_proba). Cached texts are answered from the LRU cache; the rest go
+    through one transform/predict call. Raises ModelUnavailable if the model
+    files are missing.
+    """
+    get_categorizer()  # reloading also clears the cache
+    current = _loaded
+    _, vectorizer, model, _ = current
+    results = [None] * len(cleaned_texts)
+    missing = {}
+    with _lock:
+        for i, text in enumerate(cleaned_texts):
+            hit = _cache.get(text)
+            if hit is None:
+                missing.setdefault(text, []).append(i)
+            else:
+                _cache.move_to_end(text)
+                results[i] = hit
+        misses = sum(len(indexes) for indexes in missing.values())
+        _stats["cache_hits"] += len(cleaned_texts) - misses
+        _stats["cache_misses"] += misses
+
+    if missing:
+        texts = list(missing)
+        predicted = _run_model(vectorizer, model, texts)
+        with _lock:
+            for text, result in zip(texts, predicted):
+                for i in missing[text]:
+                    results[i] = result
+                # Results from a model that was swapped out meanwhile are not cached
+                if _loaded is current:
+                    _cache[text] = result
+                    _cache.move_to_end(text)
+            while len(_cache) > CACHE_SIZE:
+                _cache.popitem(last=False)
+    return results
+
+
+def predict(cleaned_texts):
+    """
+    Categorize a list of already-cleaned texts with one transform/predict call.
+    Raises ModelUnavailable if the model files are missing.
+    """
+    return [label for label, _ in predict_with_confidence(cleaned_texts)]
+
+
+def get_metadata():
+    """Metadata of the loaded model (version, accuracy, dataset hash...)."""
+    get_categorizer()
+    return dict(_loaded[3])
+
+
+def clear_cache():
+    with _lock:
+        _cache.clear()
+
+
+def get_stats():
+    """
+    Snapshot of load, prediction and cache counters for this process, plus
+    cache hit rate and model-call latency percentiles in milliseconds.
+    """
+    with _lock:
+        stats = dict(_stats)
+        latencies = sorted(_latencies)
+        stats["cache_size"] = len(_cache)
+    lookups = stats["cache_hits"] + stats["cache_misses"]
+    stats["cache_hit_rate"] = round(stats["cache_hits"] / lookups, 4) if lookups else None
+    for name, q in (("latency_p50_ms", 0.50), ("latency_p95_ms", 0.95)):
+        stats[name] = round(latencies[int(q * (len(latencies) - 1))] * 1000, 3) if latencies else None
+    return stats
@@ -0,0 +1,243 @@
+# online_learner.py
+import os
+import pickle
+import threading
+import time
+
+import model_registry
+
+# Incremental categorizer training from the category corrections users make
+# in the edit form (database.category_feedback). A background thread picks up
+# new corrections in small batches and updates a HashingVectorizer +
+# SGDClassifier with partial_fit, so no vocabulary has to be refit. The
+# updated model replaces the served one (an atomic file swap that
+# model_registry picks up) only when it scores better on a holdout set.
+
+STATE_PATH = os.path.join("models", "online_learner.pkl")
+POLL_SECONDS = float(os.environ.get("ONLINE_LEARNING_INTERVAL", "60"))
+MIN_BATCH = int(os.environ.get("ONLINE_LEARNING_MIN_BATCH", "5"))
+MAX_BATCH = 200
+# Every HOLDOUT_EVERY-th correction is kept out of training and used to
+# compare the candidate with the served model
+HOLDOUT_EVERY = 5
+# Corrections are rarer than the bootstrap data but more relevant
+FEEDBACK_WEIGHT = 3.0
+
+
+def _is_holdout(feedback):
+    return feedback["feedback_id"] % HOLDOUT_EVERY == 0
+
+
+def _build_pipeline():
+    from sklearn.feature_extraction.text import HashingVectorizer
+    from sklearn.linear_model import SGDClassifier
+    from sklearn.pipeline import Pipeline
+
+    return Pipeline([
+        ("hashing", HashingVectorizer(n_features=2 ** 18, ngram_range=(1, 2), stop_words='english',
+                                      alternate_sign=False, norm='l2')),
+        ("clf", SGDClassifier(loss="log_loss", alpha=1e-5, random_state=42)),
+    ])
+
+
+def _dataset_split():
+    """The same train/test split mlmodel.train() uses, so the served model is scored on unseen rows."""
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+
+    import mlmodel
+
+    df = pd.read_csv(mlmodel.DATASET)
+    X = df['text'].astype(str).map(mlmodel.preprocess_text)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, df['label'], test_size=0.2, random_state=mlmodel.RANDOM_STATE, stratify=df['label']
+    )
+    return list(X_train), list(y_train), list(X_test), list(y_test)
+
+
+def _accuracy(vectorizer, model, texts, labels):
+    if not texts:
+        return None
+    predicted = model.predict(vectorizer.transform(texts))
+    return sum(str(p) == label for p, label in zip(predicted, labels)) / len(labels)
+
+
+class OnlineLearner:
+    def __init__(self, state_path=STATE_PATH, poll_seconds=POLL_SECONDS, min_batch=MIN_BATCH):
+        self.state_path = state_path
+        self.poll_seconds = poll_seconds
+        self.min_batch = min_batch
+        self.state = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.stats = {"steps": 0, "trained_rows": 0, "swaps": 0, "rejected": 0, "last_error": None}
+
+    # -- state ---------------------------------------------------------------
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def _save_state(self):
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        with open(self.state_path + ".tmp", 'wb') as f:
+            pickle.dump(self.state, f)
+        os.replace(self.state_path + ".tmp", self.state_path)
+
+    def _bootstrap(self, feedback):
+        """
+        Start a model from the training dataset plus every correction so far.
+        Also used when a correction introduces a category the model has not
+        seen, since partial_fit cannot add classes.
+        """
+        X_train, y_train, X_test, y_test = _dataset_split()
+        train_rows = [f for f in feedback if not _is_holdout(f)]
+        classes = sorted(set(y_train) | set(y_test) | {f["corrected_category"] for f in feedback})
+
+        pipeline = _build_pipeline()
+        texts = X_train + [self._clean(f["text"]) for f in train_rows]
+        labels = y_train + [f["corrected_category"] for f in train_rows]
+        weights = [1.0] * len(X_train) + [FEEDBACK_WEIGHT] * len(train_rows)
+        features = pipeline[:-1].transform(texts)
+        for _ in range(5):
+            pipeline[-1].partial_fit(features, labels, classes=classes, sample_weight=weights)
+
+        self.state = {
+            "pipeline": pipeline,
+            "classes": classes,
+            "watermark": max((f["feedback_id"] for f in feedback), default=0),
+            "holdout_texts": X_test,
+            "holdout_labels": y_test,
+        }
+
+    @staticmethod
+    def _clean(text):
+        from mlmodel import preprocess_text
+        return preprocess_text(text or "")
+
+    # -- training ------------------------------------------------------------
+
+    def _holdout(self, feedback_holdout):
+        texts = list(self.state["holdout_texts"]) + [self._clean(f["text"]) for f in feedback_holdout]
+        labels = list(self.state["holdout_labels"]) + [f["corrected_category"] for f in feedback_holdout]
+        return texts, labels
+
+    def step(self):
+        """
+        Train on corrections newer than the watermark and swap the model in if
+        it wins on the holdout. Returns a dict describing what happened.
+        """
+        from database import get_category_feedback
+
+        with self._lock:
+            if self.state is None:
+                self.state = self._load_state()
+            watermark = self.state["watermark"] if self.state else 0
+            new = get_category_feedback(after_id=watermark, limit=MAX_BATCH)
+            if len(new) < self.min_batch:
+                return {"trained": 0}
+
+            all_feedback = get_category_feedback()
+            if self.state is None or not {f["corrected_category"] for f in new} <= set(self.state["classes"]):
+                self._bootstrap(all_feedback)
+                trained = len(all_feedback)
+            else:
+                train_rows = [f for f in new if not _is_holdout(f)]
+                if train_rows:
+                    pipeline = self.state["pipeline"]
+                    features = pipeline[:-1].transform([self._clean(f["text"]) for f in train_rows])
+                    labels = [f["corrected_category"] for f in train_rows]
+                    pipeline[-1].partial_fit(features, labels, sample_weight=[FEEDBACK_WEIGHT] * len(labels))
+                self.state["watermark"] = new[-1]["feedback_id"]
+                trained = len(train_rows)
+
+            texts, labels = self._holdout([f for f in all_feedback if _is_holdout(f)])
+            pipeline = self.state["pipeline"]
+            candidate = _accuracy(pipeline[:-1], pipeline[-1], texts, labels)
+            try:
+                vectorizer, model = model_registry.get_categorizer()
+                current = _accuracy(vectorizer, model, texts, labels)
+            except model_registry.ModelUnavailable:
+                current = None
+
+            swapped = current is None or candidate > current
+            if swapped:
+                self._publish(pipeline, candidate, current, len(all_feedback))
+                self.stats["swaps"] += 1
+            else:
+                self.stats["rejected"] += 1
+            self._save_state()
+            self.stats["steps"] += 1
+            self.stats["trained_rows"] += trained
+            return {"trained": trained, "candidate_accuracy": candidate,
+                    "current_accuracy": current, "swapped": swapped}
+
+    def _publish(self, pipeline, accuracy, previous, feedback_rows):
+        from mlmodel import save_artifact
+
+        metadata = {
+            "version": f"{time.strftime('%Y%m%d%H%M%S')}-online-{self.state['watermark']}",
+            "model": "SGDClassifier",
+            "source": "online",
+            "holdout_accuracy": round(accuracy, 4),
+            "previous_holdout_accuracy": None if previous is None else round(previous, 4),
+            "feedback_rows": feedback_rows,
+            "feedback_watermark": self.state["watermark"],
+            "labels": list(self.state["classes"]),
+            "trained_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        # Written to a temp file and renamed; model_registry reloads on the new mtime
+        save_artifact(pipeline, metadata, os.path.dirname(model_registry.ARTIFACT_PATH))
+
+    # -- background thread ---------------------------------------------------
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.step()
+                self.stats["last_error"] = None
+            except Exception as e:
+                self.stats["last_error"] = str(e)
+                print(f"[online_learner] Training step failed: {e}")
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="online-learner", daemon=True)
+            self._thread.start()
+        return self
+
+    def wake(self):
+        """Run a training step now instead of waiting for the next poll."""
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+
+_learner = None
+_learner_lock = threading.Lock()
+
+
+def get_learner():
+    """Process-wide learner, created on first use."""
+    global _learner
+    if _learner is None:
+        with _learner_lock:
+            if _learner is None:
+                _learner = OnlineLearner()
+    return _learner
+
+
+def start_background_learner():
+    if os.environ.get("ONLINE_LEARNING", "1") == "0":
+        return None
+    return get_learner().start()
@@ -0,0 +1,120 @@
+# task_cli.py
+import argparse
+import csv
+import json
+import os
+import sys
+
+# Command-line entry point for bulk operations that do not need the UI.
+#
+#   python task_cli.py import tasks.csv
+#   python task_cli.py import tasks.jsonl --priority high
+#   python task_cli.py backfill-rollups
+#   python task_cli.py backfill-terms
+
+TEXT_FIELDS = ("text", "task_name", "task", "title")
+
+
+def _row_text(row, column):
+    if column:
+        return row.get(column, "")
+    for field in TEXT_FIELDS:
+        if row.get(field):
+            return row[field]
+    return ""
+
+
+def read_task_texts(path, fmt=None, column=None):
+    """
+    Yield raw task strings from a CSV file (one task per row) or a JSONL file
+    (one JSON string or object per line).
+    """
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            for row in csv.DictReader(f):
+                yield _row_text(row, column)
+        elif fmt in ("jsonl", "ndjson"):
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                yield record if isinstance(record, str) else _row_text(record, column)
+        else:
+            raise ValueError(f"Unsupported import format: {fmt!r}")
+
+
+def _chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def import_tasks(path, fmt=None, column=None, category=None, priority=None,
+                 batch_size=500, dry_run=False):
+    from agent import AdvancedTaskAgent
+    from database import add_advanced_tasks
+
+    agent = AdvancedTaskAgent()
+    total = 0
+    for chunk in _chunks(read_task_texts(path, fmt, column), batch_size):
+        parsed = agent.parse_many(chunk, forced_category=category, forced_priority=priority)
+        if dry_run:
+            for task in parsed:
+                print(json.dumps(task))
+            total += len(parsed)
+        else:
+            try:
+                total += add_advanced_tasks(parsed)
+            except Exception as e:
+                # Earlier batches are already committed
+                raise RuntimeError(f"{type(e).__name__}: {e} (after importing {total} tasks)") from e
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AI Task Manager command line tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    imp = sub.add_parser("import", help="Bulk import tasks from CSV or JSONL")
+    imp.add_argument("path")
+    imp.add_argument("--format", choices=["csv", "jsonl"], help="Defaults to the file extension")
+    imp.add_argument("--column", help="Field holding the task text (default: text/task_name/task/title)")
+    imp.add_argument("--category", help="Force a category instead of auto-detecting")
+    imp.add_argument("--priority", choices=["high", "medium", "low"])
+    imp.add_argument("--batch-size", type=int, default=500)
+    imp.add_argument("--dry-run", action="store_true", help="Print parsed tasks instead of saving")
+
+    sub.add_parser("backfill-rollups", help="Rebuild the daily analytics rollups from all tasks")
+    sub.add_parser("backfill-terms", help="Rebuild the term-frequency index from all tasks")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        try:
+            count = import_tasks(
+                args.path, fmt=args.format, column=args.column,
+                category=args.category, priority=args.priority,
+                batch_size=args.batch_size, dry_run=args.dry_run
+            )
+        except Exception as e:
+            print(f"Import failed: {e}", file=sys.stderr)
+            return 1
+        print(f"{'Parsed' if args.dry_run else 'Imported'} {count} tasks", file=sys.stderr)
+    elif args.command == "backfill-rollups":
+        from database import backfill_rollups
+        print(f"Rebuilt rollups for {backfill_rollups()} days", file=sys.stderr)
+    elif args.command == "backfill-terms":
+        from database import backfill_term_index
+        print(f"Indexed {backfill_term_index()} distinct terms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
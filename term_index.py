@@ -0,0 +1,37 @@
+# term_index.py
+import re
+from collections import Counter
+
+# Tokenisation for the term-frequency index in database.py (term_frequency
+# and term_totals tables). It has to be cheap and deterministic: every task
+# write re-tokenises the one task it touches, and the index is only correct
+# if removing a task subtracts exactly the terms adding it added.
+
+_WORDS = re.compile(r"[a-z][a-z']+")
+
+# Common English function words plus the filler that task phrasing adds
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been
+before being below between both but by can could did do does doing down during
+each few for from further had has have having he her here hers herself him
+himself his how i if in into is it its itself just let me more most my myself
+no nor not now of off on once only or other ought our ours ourselves out over
+own same she should so some such than that the their theirs them themselves
+then there these they this those through to too under until up very was we
+were what when where which while who whom why will with would you your yours
+yourself yourselves
+get got go make need needs please remember task tasks today tomorrow tonight
+todo week month next pm
+""".split())
+
+
+def task_terms(text):
+    """Counter of index terms in a task name: lowercase words, "'s" stripped, stopwords dropped."""
+    terms = Counter()
+    for word in _WORDS.findall((text or "").lower()):
+        if word.endswith("'s"):
+            word = word[:-2]
+        word = word.strip("'")
+        if len(word) > 1 and word not in STOPWORDS:
+            terms[word] += 1
+    return terms
@@ -0,0 +1,76 @@
+# tests/test_concurrency.py
+import random
+import threading
+
+import pytest
+
+import database
+from benchmarks.synthetic import fill_database, sample_task
+
+CATEGORIES = {"work": ["report", "meeting"], "personal": ["groceries", "laundry"]}
+INITIAL_TASKS = 200
+WRITERS = 4
+READERS = 8
+WRITES_PER_WRITER = 25
+
+
+@pytest.fixture
+def scratch_db(tmp_path):
+    db = database.use_database(str(tmp_path / "tasks.db"))
+    fill_database(db, INITIAL_TASKS, CATEGORIES)
+    yield db
+    database.close_database()
+
+
+def test_concurrent_reads_and_writes(scratch_db):
+    assert scratch_db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    errors = []
+    writers_done = threading.Event()
+
+    def write(seed):
+        rng = random.Random(seed)
+        try:
+            for _ in range(WRITES_PER_WRITER):
+                if not database.add_advanced_task(sample_task(CATEGORIES, rng)):
+                    errors.append("add_advanced_task failed")
+                if not database.update_task_status(rng.randint(1, INITIAL_TASKS),
+                                                   rng.choice(("completed", "pending"))):
+                    errors.append("update_task_status failed")
+        except Exception as e:
+            errors.append(str(e))
+
+    def read():
+        try:
+            while not writers_done.is_set():
+                database.get_connection().execute(database.OPEN_TASKS_SQL + " LIMIT 25").fetchall()
+                database.get_task_metrics()
+        except Exception as e:
+            errors.append(str(e))
+
+    readers = [threading.Thread(target=read) for _ in range(READERS)]
+    writers = [threading.Thread(target=write, args=(seed,)) for seed in range(WRITERS)]
+    for thread in readers + writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    writers_done.set()
+    for thread in readers:
+        thread.join()
+
+    assert errors == []
+    count = scratch_db.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+    assert count == INITIAL_TASKS + WRITERS * WRITES_PER_WRITER
+    assert database.get_manager().get_stats()["writes"] == 2 * WRITERS * WRITES_PER_WRITER
+
+
+def test_reopens_after_close(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "DB_PATH", str(tmp_path / "tasks.db"))
+    database.close_database()
+    first = database.get_manager()
+    database.close_database()
+    second = database.get_manager()
+    try:
+        assert second is not first
+        assert database.get_connection().execute("SELECT COUNT(*) FROM tasks").fetchone() == (0,)
+    finally:
+        database.close_database()
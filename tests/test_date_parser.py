@@ -0,0 +1,76 @@
+# tests/test_date_parser.py
+from datetime import datetime
+
+import pytest
+
+from date_parser import parse_datetime
+
+# A Wednesday, mid-morning, late in a 31-day month
+NOW = datetime(2026, 1, 28, 10, 30, 45)
+
+
+@pytest.mark.parametrize("text,expected", [
+    # No date or time at all: tomorrow, midnight
+    ("water the plants", datetime(2026, 1, 29, 0, 0)),
+    ("buy milk today", datetime(2026, 1, 28, 0, 0)),
+    ("tonight call mom", datetime(2026, 1, 28, 0, 0)),
+    ("pay rent tomorrow", datetime(2026, 1, 29, 0, 0)),
+    ("renew passport day after tomorrow", datetime(2026, 1, 30, 0, 0)),
+    ("plan trip next week", datetime(2026, 2, 4, 0, 0)),
+    # Calendar month, clamped to the shorter month's last day
+    ("dentist next month", datetime(2026, 2, 28, 0, 0)),
+    ("file report in 2 months", datetime(2026, 3, 28, 0, 0)),
+    ("friday standup", datetime(2026, 1, 30, 0, 0)),
+    ("this friday standup", datetime(2026, 1, 30, 0, 0)),
+    ("next friday standup", datetime(2026, 1, 30, 0, 0)),
+    # Today's weekday: plain and "this" mean today, "next" means a week later
+    ("wednesday review", datetime(2026, 1, 28, 0, 0)),
+    ("this wednesday review", datetime(2026, 1, 28, 0, 0)),
+    ("next wednesday review", datetime(2026, 2, 4, 0, 0)),
+    ("submit in 3 days", datetime(2026, 1, 31, 0, 0)),
+    ("end of week report", datetime(2026, 2, 1, 0, 0)),
+    ("end of month invoices", datetime(2026, 1, 31, 0, 0)),
+    # ISO dates are year-month-day, not day-month-year
+    ("tax filing 2026-03-04", datetime(2026, 3, 4, 0, 0)),
+    ("deploy 2026/03/04", datetime(2026, 3, 4, 0, 0)),
+    ("party 04/03/2026", datetime(2026, 3, 4, 0, 0)),
+    ("party 04-03-26", datetime(2026, 3, 4, 0, 0)),
+])
+def test_date_without_time(text, expected):
+    assert parse_datetime(text, now=NOW) == (expected, False)
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("buy milk tomorrow at 5pm", datetime(2026, 1, 29, 17, 0)),
+    ("call at 12am", datetime(2026, 1, 29, 0, 0)),
+    ("lunch 12:30pm friday", datetime(2026, 1, 30, 12, 30)),
+    ("standup 09:15 next monday", datetime(2026, 2, 2, 9, 15)),
+    ("tonight at 8pm", datetime(2026, 1, 28, 20, 0)),
+    ("meeting noon", datetime(2026, 1, 29, 12, 0)),
+    ("release 2026-03-04T14:30", datetime(2026, 3, 4, 14, 30)),
+    ("release 2026-03-04 14:30:15Z", datetime(2026, 3, 4, 14, 30)),
+    ("end of day summary", datetime(2026, 1, 28, 23, 59)),
+    # Sub-day offsets fix the date and the time, to the minute
+    ("stretch in 3 hours", datetime(2026, 1, 28, 13, 30)),
+    ("tea in 45 minutes", datetime(2026, 1, 28, 11, 15)),
+    ("check oven in an hour", datetime(2026, 1, 28, 11, 30)),
+    ("stretch in 20 hours", datetime(2026, 1, 29, 6, 30)),
+])
+def test_date_with_time(text, expected):
+    assert parse_datetime(text, now=NOW) == (expected, True)
+
+
+def test_explicit_date_beats_relative_words():
+    assert parse_datetime("move tomorrow's call to 2026-02-10", now=NOW) == (datetime(2026, 2, 10), False)
+
+
+def test_invalid_date_falls_back_to_default():
+    assert parse_datetime("order 2026-02-30 calendars", now=NOW) == (datetime(2026, 1, 29), False)
+
+
+def test_now_defaults_to_current_time():
+    before = datetime.now()
+    due, has_time = parse_datetime("water the plants")
+    assert not has_time
+    assert due.time() == datetime.min.time()
+    assert due.date() > before.date()
@@ -0,0 +1,117 @@
+# tests/test_email_delivery.py
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import database
+import email_delivery
+import email_reminder
+from benchmarks.bench_email_delivery import start_stub_server
+from email_delivery import DeliveryWorker, EmailDeliveryError
+
+
+def _messages(count):
+    return [
+        {"recipient_email": f"user{i}@example.com", "subject": f"Reminder {i}", "html_content": "<p>hi</p>"}
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def make_worker():
+    """Start the stub with the given options; return a worker pointed at it and the stub's handler."""
+    started = []
+
+    def make(script=(), latency=0.0, **worker_options):
+        server, url = start_stub_server(latency=latency, script=script)
+        worker = DeliveryWorker(api_key="stub", api_url=url, **worker_options)
+        started.append((server, worker))
+        return worker, server.RequestHandlerClass
+
+    yield make
+    for server, worker in started:
+        worker.close()
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Backoff delays the worker asked for, without waiting for them."""
+    delays = []
+    monkeypatch.setattr(email_delivery, "time", SimpleNamespace(perf_counter=time.perf_counter, sleep=delays.append))
+    return delays
+
+
+def test_retries_429_and_503_then_delivers(make_worker, sleeps):
+    worker, stub = make_worker(script=[(429, {}), (503, {})])
+    assert worker.send_batch(_messages(1)) == [None]
+    assert stub.received == ["user0@example.com"]
+    stats = worker.stats()
+    assert (stats["requests"], stats["retries"], stats["messages_sent"]) == (3, 2, 1)
+    assert len(sleeps) == 2
+
+
+def test_retry_after_sets_the_delay(make_worker, sleeps):
+    worker, stub = make_worker(script=[(429, {"Retry-After": "7"}), (429, {"Retry-After": "120"})],
+                         max_backoff_seconds=30)
+    assert worker.send_batch(_messages(1)) == [None]
+    # Retry-After is honoured, but never beyond max_backoff_seconds
+    assert sleeps == [7.0, 30.0]
+
+
+def test_gives_up_after_max_retries(make_worker, sleeps):
+    worker, stub = make_worker(script=[(429, {})] * 3, max_retries=2)
+    [error] = worker.send_batch(_messages(1))
+    assert isinstance(error, EmailDeliveryError)
+    assert error.status_code == 429
+    assert stub.requests == [1, 1, 1]
+    assert worker.stats()["messages_failed"] == 1
+
+
+def test_client_errors_are_not_retried(make_worker, sleeps):
+    worker, stub = make_worker(script=[(400, {})])
+    [error] = worker.send_batch(_messages(1))
+    assert error.status_code == 400
+    assert stub.requests == [1]
+    assert sleeps == []
+
+
+def test_read_timeout_is_not_retried(make_worker, sleeps):
+    # The stub answers after the read timeout, but it has received the request
+    worker, stub = make_worker(latency=0.5, timeout=(3.05, 0.1))
+    [error] = worker.send_batch(_messages(1))
+    assert isinstance(error, EmailDeliveryError)
+    assert stub.requests == [1]
+    assert sleeps == []
+
+
+def test_batches_messages_into_chunks(make_worker, sleeps, monkeypatch):
+    monkeypatch.setattr(email_delivery, "MAX_BATCH_SIZE", 2)
+    worker, stub = make_worker()
+    assert worker.submit(_messages(5)).result() == [None] * 5
+    assert stub.requests == [2, 2, 1]
+    assert sorted(stub.received) == sorted(m["recipient_email"] for m in _messages(5))
+
+
+def test_failed_chunk_does_not_fail_the_others(make_worker, sleeps, monkeypatch):
+    monkeypatch.setattr(email_delivery, "MAX_BATCH_SIZE", 2)
+    worker, stub = make_worker(script=[None, (400, {})])
+    outcomes = worker.submit(_messages(5)).result()
+    assert [error is None for error in outcomes] == [True, True, False, False, True]
+    assert stub.requests == [2, 2, 1]
+
+
+def test_record_outcome_marks_only_the_failed_chunk(tmp_path):
+    database.use_database(str(tmp_path / "tasks.db"))
+    try:
+        ids = [
+            database.save_reminder(f"task-{i}", "user@example.com", "Reminder", "<p>hi</p>", "2030-01-01 09:00:00")
+            for i in range(3)
+        ]
+        reminders = database.claim_reminders(reminder_ids=ids)
+        email_reminder._record_outcome(reminders)([None, EmailDeliveryError("Email failed: 400", 400), None])
+        assert [database.get_reminder(i)["status"] for i in ids] == ["sent", "failed", "sent"]
+    finally:
+        database.close_database()
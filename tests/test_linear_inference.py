@@ -0,0 +1,71 @@
+# tests/test_linear_inference.py
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import mlmodel
+import model_registry
+from linear_inference import LinearCategorizer
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    df = pd.read_csv(os.path.join(os.path.dirname(os.path.dirname(__file__)), mlmodel.DATASET))
+    # A stratified slice keeps fitting fast while covering every category
+    df = df.groupby("label").head(40)
+    return df["text"].astype(str).map(mlmodel.preprocess_text).tolist(), df["label"].tolist()
+
+
+def _fit(clf, dataset):
+    from sklearn.base import clone
+
+    texts, labels = dataset
+    pipeline, _ = mlmodel.candidate_grid()
+    pipeline = clone(pipeline).set_params(clf=clf)
+    return pipeline.fit(texts, labels)
+
+
+@pytest.mark.parametrize("model", ["LogisticRegression", "MultinomialNB"])
+def test_exported_model_matches_sklearn(tmp_path, dataset, model):
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.naive_bayes import MultinomialNB
+
+    clf = LogisticRegression(max_iter=1000, C=10.0) if model == "LogisticRegression" else MultinomialNB(alpha=0.5)
+    pipeline = _fit(clf, dataset)
+    path = mlmodel.export_linear_model(pipeline, str(tmp_path / "model.npz"))
+    linear = LinearCategorizer(path)
+
+    texts = dataset[0] + [mlmodel.preprocess_text(text) for text in mlmodel.SAMPLE_TASKS] + ["", "zzz unseen words"]
+    features = linear.transform(texts)
+    np.testing.assert_array_equal(linear.predict(features), pipeline.predict(texts))
+    np.testing.assert_allclose(linear.predict_proba(features), pipeline.predict_proba(texts), rtol=1e-9, atol=1e-12)
+    np.testing.assert_array_equal(linear.classes_, pipeline.classes_)
+
+
+def test_non_linear_model_is_not_exported(tmp_path, dataset):
+    from sklearn.ensemble import RandomForestClassifier
+
+    pipeline = _fit(RandomForestClassifier(n_estimators=5, random_state=0), dataset)
+    with pytest.raises(ValueError):
+        mlmodel.export_linear_model(pipeline, str(tmp_path / "model.npz"))
+
+
+def test_linear_only_training_exports_the_served_model(tmp_path, dataset, monkeypatch):
+    texts, labels = dataset
+    csv = tmp_path / "tasks.csv"
+    pd.DataFrame({"text": texts, "label": labels}).to_csv(csv, index=False)
+    model_dir = tmp_path / "models"
+
+    metadata = mlmodel.train(str(csv), str(model_dir), n_jobs=1, cv=2, verbose=False,
+                             export_linear=True, linear_only=True)
+    assert metadata["model"] in mlmodel.LINEAR_MODELS
+    assert set(metadata["cv_results"]) <= set(mlmodel.LINEAR_MODELS)
+
+    monkeypatch.setattr(model_registry, "LINEAR_PATH", str(model_dir / mlmodel.LINEAR_EXPORT_NAME))
+    monkeypatch.setattr(model_registry, "ARTIFACT_PATH", str(model_dir / mlmodel.ARTIFACT_NAME))
+    monkeypatch.setattr(model_registry, "_loaded", None)
+    assert model_registry._file_key()[0] == model_registry.LINEAR_PATH
+    assert model_registry.get_metadata()["version"] == metadata["version"]
+    monkeypatch.setattr(model_registry, "_loaded", None)
@@ -0,0 +1,77 @@
+# tests/test_query_plans.py
+import sqlite3
+
+import pytest
+
+import database
+from benchmarks.check_query_plans import HOT_QUERIES, plan_problems
+
+# Index each hot query must be answered from
+EXPECTED_INDEXES = {
+    "get_all_tasks": "idx_tasks_open_due",
+    "get_completed_tasks": "idx_tasks_status_created",
+    "get_overdue_tasks": "idx_tasks_open_due",
+    "get_pending_tasks": "idx_tasks_status_due",
+    "get_top_terms": "idx_term_totals_count",
+    "get_top_terms_open": "idx_term_totals_open",
+}
+
+# query_tasks filters (All Tasks page) -> index
+FILTER_INDEXES = [
+    ({"category": "work"}, "idx_tasks_category"),
+    ({"priority": "high"}, "idx_tasks_priority"),
+    ({"due_from": "2030-01-01 00:00:00", "due_to": "2030-01-02 00:00:00"}, "idx_tasks_open_due"),
+    ({"status": "completed", "due_from": "2030-01-01 00:00:00"}, "idx_tasks_status_due"),
+]
+
+
+@pytest.fixture
+def db(tmp_path):
+    c = sqlite3.connect(tmp_path / "tasks.db")
+    database.create_schema(c)
+    yield c
+    c.close()
+
+
+def test_migrations_bring_schema_to_latest_version(db):
+    assert db.execute("PRAGMA user_version").fetchone()[0] == len(database.SCHEMA_MIGRATIONS)
+    # Re-running is a no-op
+    assert database.apply_migrations(db) == len(database.SCHEMA_MIGRATIONS)
+
+
+@pytest.mark.parametrize("name", sorted(EXPECTED_INDEXES))
+def test_hot_query_uses_index(db, name):
+    sql, params = HOT_QUERIES[name]
+    plan = database.explain_query_plan(sql, params, db=db)
+    assert plan_problems(plan) == []
+    assert any(EXPECTED_INDEXES[name] in line for line in plan), plan
+
+
+@pytest.mark.parametrize("filters,index", FILTER_INDEXES)
+def test_filtered_page_uses_index(db, filters, index):
+    where, params = database._task_filter_sql(**filters)
+    sql = f"SELECT * FROM tasks WHERE {where} ORDER BY due_date ASC, task_id ASC LIMIT 25"
+    plan = database.explain_query_plan(sql, params, db=db)
+    assert plan_problems(plan) == []
+    assert any(index in line for line in plan), plan
+
+
+def test_failed_migration_is_rolled_back(tmp_path, monkeypatch):
+    def fail(db, *args):
+        raise RuntimeError("rollup backfill failed")
+
+    path = tmp_path / "tasks.db"
+    monkeypatch.setattr(database, "_rebuild_rollups", fail)
+    c = sqlite3.connect(path)
+    with pytest.raises(RuntimeError):
+        database.create_schema(c)
+    # Migration 2 added completed_at before failing; none of it may stick
+    assert c.execute("PRAGMA user_version").fetchone()[0] == 1
+    assert "completed_at" not in [row[1] for row in c.execute("PRAGMA table_info(tasks)")]
+    c.close()
+
+    monkeypatch.undo()
+    c = sqlite3.connect(path)
+    database.create_schema(c)
+    assert c.execute("PRAGMA user_version").fetchone()[0] == len(database.SCHEMA_MIGRATIONS)
+    c.close()
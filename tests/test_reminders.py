@@ -0,0 +1,53 @@
+# tests/test_reminders.py
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+import database
+import email_reminder
+
+
+@pytest.fixture
+def scratch_db(tmp_path):
+    yield database.use_database(str(tmp_path / "tasks.db"))
+    database.close_database()
+
+
+def _save(task_key, send_at):
+    return database.save_reminder(task_key, "user@example.com", "Reminder", "<p>hi</p>", send_at)
+
+
+def test_reminder_job_never_runs_before_send_time(monkeypatch):
+    jobs = []
+    scheduler = SimpleNamespace(add_job=lambda func, **options: jobs.append(options))
+    monkeypatch.setattr(email_reminder, "get_scheduler", lambda: scheduler)
+
+    email_reminder.schedule_reminder(datetime(2030, 1, 1, 9, 5, 30))
+    email_reminder.schedule_reminder(datetime(2030, 1, 1, 9, 5))
+    assert [(job["run_date"], job["args"]) for job in jobs] == [
+        (datetime(2030, 1, 1, 9, 6), [datetime(2030, 1, 1, 9, 6)]),
+        (datetime(2030, 1, 1, 9, 5), [datetime(2030, 1, 1, 9, 5)]),
+    ]
+
+
+def test_claim_takes_reminders_due_by_the_job_time(scratch_db):
+    due = [_save("a", "2030-01-01 09:05:00"), _save("b", "2030-01-01 09:05:30"), _save("c", "2030-01-01 09:06:00")]
+    _save("d", "2030-01-01 09:06:01")
+    claimed = database.claim_reminders(due_by="2030-01-01 09:06:00")
+    assert [reminder["reminder_id"] for reminder in claimed] == due
+    assert database.claim_reminders(due_by="2030-01-01 09:06:00") == []
+
+
+def test_restore_releases_only_expired_claims(scratch_db, monkeypatch):
+    monkeypatch.setattr(email_reminder, "schedule_reminder", lambda send_at: None)
+    stale, live = _save("stale", "2030-01-01 09:00:00"), _save("live", "2030-01-01 09:00:00")
+    database.claim_reminders(reminder_ids=[stale, live])
+    # Claimed by a process that died an hour ago; `live` was claimed just now
+    an_hour_ago = (datetime.now() - timedelta(hours=1)).strftime("%Y-%m-%d %H:%M:%S")
+    scratch_db.execute("UPDATE reminders SET claimed_at = ? WHERE reminder_id = ?", (an_hour_ago, stale))
+    scratch_db.commit()
+
+    email_reminder.restore_reminders()
+    assert database.get_reminder(stale)["status"] == "pending"
+    assert database.get_reminder(live)["status"] == "sending"
@@ -1,9 +1,8 @@
 # ui_components.py
 import streamlit as st
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
 from database import update_task, update_task_status, delete_task
-import pandas as pd
 
 
 def display_advanced_task_card(task):
@@ -51,6 +50,9 @@ def display_advanced_task_card(task):
                             task["ai_suggestions"],
                             task["context_keywords"]
                         ):
+                            if new_category.strip().lower() != (task['category'] or "").strip().lower():
+                                from online_learner import get_learner
+                                get_learner().wake()
                             st.success("✅ Task updated")
                             st.session_state.edit_task_id = None
                             st.rerun()
@@ -95,36 +97,119 @@ def display_advanced_task_card(task):
                         st.rerun()
 
 
+PAGE_SIZE_OPTIONS = [10, 25, 50, 100]
+
+
+def _page_size():
+    from database import DEFAULT_PAGE_SIZE
+    return st.sidebar.selectbox(
+        "Tasks per page", PAGE_SIZE_OPTIONS,
+        index=PAGE_SIZE_OPTIONS.index(DEFAULT_PAGE_SIZE), key="page_size"
+    )
+
+
+def render_task_pages(key, fetch_page, total, signature=None):
+    """
+    Render one page of task cards with Previous/Next navigation.
+
+    fetch_page(cursor, limit) returns (df, next_cursor). The cursors of the
+    pages visited so far are kept in session state, so each rerun fetches and
+    renders only the visible page. Changing `signature` (e.g. the active
+    filters or page size) starts again from the first page.
+    """
+    page_size = _page_size()
+    state_key = f"{key}_pages"
+    signature = (signature, page_size)
+    if st.session_state.get(f"{state_key}_signature") != signature:
+        st.session_state[state_key] = [None]
+        st.session_state[f"{state_key}_signature"] = signature
+    cursors = st.session_state[state_key]
+
+    page_df, next_cursor = fetch_page(cursors[-1], page_size)
+    page_number = len(cursors)
+    page_count = max(1, -(-total // page_size))
+
+    for _, task in page_df.iterrows():
+        display_advanced_task_card(task)
+        st.divider()
+
+    col_prev, col_info, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        if page_number > 1 and st.button("⬅️ Previous", key=f"{key}_prev"):
+            cursors.pop()
+            st.rerun()
+    with col_info:
+        st.caption(f"Page {page_number} of {page_count} • {total} tasks")
+    with col_next:
+        if page_number < page_count and next_cursor is not None and st.button("Next ➡️", key=f"{key}_next"):
+            cursors.append(next_cursor)
+            st.rerun()
+
+
+def _view_fetcher(view):
+    from database import get_task_page, page_cursor, TASK_VIEWS
+
+    def fetch(cursor, limit):
+        df = get_task_page(view, after=cursor, limit=limit)
+        return df, page_cursor(df, TASK_VIEWS[view][0])
+    return fetch
+
+
+def date_filter_bounds(date_filter, now=None):
+    """
+    Translate a date filter choice into (due_from, due_to) strings, with
+    due_from inclusive and due_to exclusive.
+    """
+    now = now or datetime.now()
+    fmt = '%Y-%m-%d %H:%M:%S'
+    today = datetime.combine(now.date(), datetime.min.time())
+
+    if date_filter == "Today":
+        start, end = today, today + timedelta(days=1)
+    elif date_filter == "This Week":
+        start = today - timedelta(days=today.weekday())
+        end = start + timedelta(days=7)
+    elif date_filter == "This Month":
+        start = today.replace(day=1)
+        end = (start + timedelta(days=32)).replace(day=1)
+    elif date_filter == "Overdue":
+        # To the minute, like database._now_minute: the bound is part of the read-cache key
+        return None, now.replace(second=0, microsecond=0).strftime(fmt)
+    else:
+        return None, None
+    return start.strftime(fmt), end.strftime(fmt)
+
+
 def show_completed_tasks_page():
-    from database import get_completed_tasks
+    from database import count_tasks
     st.header("✅ Completed Tasks")
-    df = get_completed_tasks()
-    if df.empty:
+    total = count_tasks("completed")
+    if not total:
         st.info("No completed tasks yet.")
         return
-    for _, task in df.iterrows():
-        display_advanced_task_card(task)
-        st.divider()
+    render_task_pages("completed", _view_fetcher("completed"), total)
 
 
 def show_overdue_tasks_page():
-    from database import get_overdue_tasks
+    from database import count_tasks
     st.header("⏰ Overdue Tasks")
-    df = get_overdue_tasks()
-    if df.empty:
+    total = count_tasks("overdue")
+    if not total:
         st.success("🎉 No overdue tasks!")
         return
-    for _, task in df.iterrows():
-        display_advanced_task_card(task)
-        st.divider()
+    render_task_pages("overdue", _view_fetcher("overdue"), total)
 
 
 def show_all_tasks_page(agent):
-    from database import get_all_tasks
-    from datetime import datetime, timedelta
+    from database import query_tasks, count_matching_tasks, page_cursor, search_tasks, count_search_results
 
     st.header("📋 All Tasks")
 
+    search_text = st.text_input(
+        "🔍 Search tasks", key="task_search",
+        placeholder="Words or word starts, e.g. \"rep mon\" finds \"monthly report\""
+    ).strip()
+
     # 👉 Horizontal filters like in uimai.py
     col1, col2, col3 = st.columns([1, 1, 1])
     with col1:
@@ -140,49 +225,39 @@ def show_all_tasks_page(agent):
             "Filter by Date", ["All", "Today", "This Week", "This Month", "Overdue"], index=0
         )
 
-    df = get_all_tasks()
-    if df.empty:
+    due_from, due_to = date_filter_bounds(date_filter)
+    filters = {
+        "priority": None if priority_filter == "All" else priority_filter,
+        "category": None if category_filter == "All" else category_filter,
+        "due_from": due_from,
+        "due_to": due_to,
+    }
+
+    if search_text:
+        total = count_search_results(search_text, **filters)
+    else:
+        total = count_matching_tasks(**filters)
+    if not total:
         st.info("No tasks found.")
         return
 
-    filtered_df = df.copy()
-
-    # Apply filters
-    if priority_filter != "All":
-        filtered_df = filtered_df[filtered_df["priority"] == priority_filter]
-
-    if category_filter != "All":
-        filtered_df = filtered_df[filtered_df["category"] == category_filter]
-
-    if date_filter != "All":
-        now = datetime.now()
-        today = now.date()
-
-        if date_filter == "Today":
-            filtered_df = filtered_df[
-                pd.to_datetime(filtered_df["due_date"]).dt.date == today
-            ]
-        elif date_filter == "This Week":
-            week_start = today - timedelta(days=today.weekday())
-            week_end = week_start + timedelta(days=6)
-            filtered_df = filtered_df[
-                (pd.to_datetime(filtered_df["due_date"]).dt.date >= week_start)
-                & (pd.to_datetime(filtered_df["due_date"]).dt.date <= week_end)
-            ]
-        elif date_filter == "This Month":
-            filtered_df = filtered_df[
-                pd.to_datetime(filtered_df["due_date"]).dt.month == today.month
-            ]
-        elif date_filter == "Overdue":
-            filtered_df = filtered_df[
-                pd.to_datetime(filtered_df["due_date"]) < now
-            ]
-
-    st.markdown(f"**Found {len(filtered_df)} tasks**")
-
-    for _, task in filtered_df.iterrows():
-        display_advanced_task_card(task)
-        st.divider()
+    st.markdown(f"**Found {total} tasks**")
+
+    if search_text:
+        # Best matches first; ranked results are paged by offset
+        def fetch(offset, limit):
+            offset = offset or 0
+            df = search_tasks(search_text, limit=limit, offset=offset, **filters)
+            return df, offset + limit
+    else:
+        def fetch(cursor, limit):
+            df = query_tasks(after=cursor, limit=limit, **filters)
+            return df, page_cursor(df)
+
+    render_task_pages(
+        "all", fetch, total,
+        signature=(priority_filter, category_filter, date_filter, search_text)
+    )
 
 def show_add_task_page(agent):
     from database import add_advanced_task
@@ -250,7 +325,9 @@ def show_add_task_page(agent):
             if estimate > 0:
                 parsed["estimated_duration"] = estimate
 
-            if add_advanced_task(parsed):
+            task_id = add_advanced_task(parsed)
+            if task_id:
+                parsed["task_id"] = task_id
                 st.session_state["show_notify"] = True
                 st.session_state["last_task"] = parsed
                 st.success("Task added")
@@ -1,24 +1,80 @@
 # utils.py
-from datetime import datetime, timedelta
+from datetime import datetime
 import re
+import threading
+
+from date_parser import parse_datetime
 
 # This file intentionally does NOT import streamlit or call st.set_page_config
 # to avoid violating Streamlit's page config order restriction
 
+# Pipeline components each caller can skip. Tags only need lemmas, entities
+# only need NER, and nobody reads the dependency parse.
+TAG_DISABLE = ("parser", "ner")
+ENTITY_DISABLE = ("parser", "lemmatizer")
+SHARED_DISABLE = ("parser",)
+
+_nlp = None
+_nlp_loaded = False
+_nlp_lock = threading.Lock()
+
+
 def load_nlp_models():
-    try:
-        import spacy
-        return spacy.load("en_core_web_sm")
-    except Exception:
+    """
+    Return the process-wide spaCy pipeline, loading it on first use.
+    Returns None if spaCy or en_core_web_sm is not installed.
+    """
+    global _nlp, _nlp_loaded
+    if not _nlp_loaded:
+        with _nlp_lock:
+            if not _nlp_loaded:
+                try:
+                    import spacy
+                    _nlp = spacy.load("en_core_web_sm")
+                except Exception:
+                    _nlp = None
+                _nlp_loaded = True
+    return _nlp
+
+
+def _disabled(nlp, names):
+    return [name for name in names if name in nlp.pipe_names]
+
+
+def nlp_doc(text, disable=SHARED_DISABLE):
+    """
+    Run the shared pipeline over text once, skipping the given components.
+    The default keeps everything extract_tags and extract_entities need so a
+    single Doc can be passed to both.
+    """
+    nlp = load_nlp_models()
+    if not nlp:
         return None
+    return nlp(text, disable=_disabled(nlp, disable))
 
-def extract_tags(text):
+
+def nlp_docs(texts, disable=SHARED_DISABLE, batch_size=64):
+    """Batch version of nlp_doc built on nlp.pipe."""
+    nlp = load_nlp_models()
+    if not nlp:
+        return [None] * len(texts)
+    return list(nlp.pipe(texts, disable=_disabled(nlp, disable), batch_size=batch_size))
+
+
+def extract_entities(text, doc=None):
+    if doc is None:
+        doc = nlp_doc(text, disable=ENTITY_DISABLE)
+    if doc is None:
+        return []
+    return [ent.text for ent in doc.ents if ent.label_ in ['PERSON', 'ORG', 'GPE', 'DATE', 'TIME']]
+
+
+def extract_tags(text, doc=None):
     try:
-        import spacy
-        nlp = load_nlp_models()
-        if not nlp:
+        if doc is None:
+            doc = nlp_doc(text, disable=TAG_DISABLE)
+        if doc is None:
             return ""
-        doc = nlp(text)
         keywords = [token.lemma_.lower() for token in doc if token.is_alpha and not token.is_stop and len(token.text) > 2]
         hashtags = set(re.findall(r"#\w+", text)) | set("#" + w for w in keywords[:3])
         return " ".join(hashtags)
@@ -26,48 +82,8 @@ def extract_tags(text):
         return ""
 
 def parse_date_expressions(text):
-    base = datetime.now()
-    text = text.lower()
-    date_patterns = [
-        r'(\d{1,2})[/-](\d{1,2})[/-](\d{2,4})',
-        r'(\d{4})[/-](\d{1,2})[/-](\d{1,2})'
-    ]
-
-    for pat in date_patterns:
-        match = re.search(pat, text)
-        if match:
-            try:
-                if len(match.groups()) == 3:
-                    g = list(map(int, match.groups()))
-                    if g[0] > 31:  # Assume YYYY/MM/DD
-                        return datetime(g[0], g[1], g[2])
-                    elif g[2] > 31:  # DD/MM/YYYY
-                        return datetime(g[2], g[1], g[0])
-                    else:  # DD/MM/YY
-                        return datetime(2000 + g[2], g[1], g[0])
-            except:
-                continue
-
-    relative = {
-        "today": 0, "tomorrow": 1,
-        "day after tomorrow": 2,
-        "next week": 7, "next month": 30
-    }
-    for key, offset in relative.items():
-        if key in text:
-            return base + timedelta(days=offset)
-
-    for m in re.finditer(r'in (\d+) days?', text):
-        return base + timedelta(days=int(m.group(1)))
-
-    days = {"monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
-            "friday": 4, "saturday": 5, "sunday": 6}
-    for name, num in days.items():
-        if name in text:
-            delta = (num - base.weekday() + 7) % 7
-            return base + timedelta(days=delta)
-
-    return base + timedelta(days=1)
+    """Due date named in the text (tomorrow when none is given); see date_parser.parse_datetime."""
+    return parse_datetime(text)[0]
 
 def initialize_session_defaults():
     import streamlit as st